@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+"""
+Gutenberg Extraction Benchmarks
+
+Micro-benchmarks for the hot paths of gutenberg-extraction.py, and a
+throughput suite over synthetic Gutenberg-style books from 100 KB to 100 MB.
+Everything runs offline.
+
+Usage:
+    python gutenberg-benchmark.py [options]
+    python gutenberg-benchmark.py --suite [--sizes 100K,1M] [--baseline FILE]
+
+Example:
+    python gutenberg-benchmark.py
+    python gutenberg-benchmark.py --chapters 5000 --repeat 7
+    python gutenberg-benchmark.py --html pg100-images.html   # Complete Works of Shakespeare
+    python gutenberg-benchmark.py --suite --save-baseline bench-baseline.json
+    python gutenberg-benchmark.py --suite --baseline bench-baseline.json --threshold 0.25
+"""
+
+import re
+import os
+import sys
+import json
+import argparse
+import contextlib
+import importlib.util
+import io
+import platform
+import subprocess
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+
+def load_extractor():
+    """Import gutenberg-extraction.py (not importable by name: it has a dash)."""
+    path = Path(__file__).with_name('gutenberg-extraction.py')
+    spec = importlib.util.spec_from_file_location('gutenberg_extraction', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+gx = load_extractor()
+
+
+# =============================================================================
+# Synthetic Corpus
+# =============================================================================
+
+ROMAN = ['i', 'ii', 'iii', 'iv', 'v', 'vi', 'vii', 'viii', 'ix', 'x']
+FILLER_HEADINGS = [
+    'The Storm', 'A Letter From Home', 'In Which Nothing Happens', 'Notes on the Voyage',
+    'The Index of Souls', 'Contents of the Chest', 'Afterwards',
+]
+
+
+def roman(n: int) -> str:
+    return ''.join(ROMAN[int(d)] if d != '0' else '' for d in str(n)) or 'x'
+
+
+def make_headings(count: int) -> List[str]:
+    """Heading texts in the mix a large Gutenberg book produces."""
+    headings = []
+    for n in range(1, count + 1):
+        kind = n % 8
+        if kind == 0:
+            headings.append(f'CHAPTER {roman(n).upper()}.')
+        elif kind == 1:
+            headings.append(f'Chapter {n}')
+        elif kind == 2:
+            headings.append(f'{roman(n).upper()}.')
+        elif kind == 3:
+            headings.append(f'Letter {n}')
+        elif kind == 4:
+            headings.append(FILLER_HEADINGS[n % len(FILLER_HEADINGS)])
+        elif kind == 5:
+            headings.append(f'<span class="pagenum">{n}</span> {FILLER_HEADINGS[n % 3]}')
+        elif kind == 6:
+            headings.append(['Preface', 'Table of Contents', 'Appendix B', 'Epilogue'][n % 4])
+        else:
+            headings.append(f'PART {roman(n).upper()} THE RETURN')
+    return headings
+
+
+def make_element_ids(count: int) -> List[str]:
+    ids = []
+    for n in range(1, count + 1):
+        ids.extend([f'chapter-{n}', f'CHAP_{roman(n)}', f'link2H_{n}', f'Page_{n}',
+                    f'pg-footer-{n}', f'preface{n}', f'fn{n}', str(n)])
+    return ids
+
+
+def make_book(chapters: int, paragraphs: int = 6) -> str:
+    """A heading-heavy book: many short chapters with TOC links."""
+    toc = ''.join(f'<p><a href="#chapter-{n}">Chapter {n}</a></p>\n' for n in range(1, chapters + 1))
+    body = []
+    for n in range(1, chapters + 1):
+        body.append(f'<div class="chapter" id="chapter-{n}">\n<h2>CHAPTER {roman(n).upper()}.</h2>\n')
+        body.extend(f'<p>Paragraph {p} of chapter {n}, with <i>some</i> text.</p>\n' for p in range(paragraphs))
+        body.append('</div>\n')
+    return (
+        '<html><head><title>The Project Gutenberg eBook of Benchmark</title></head><body>\n'
+        + '<p>Title: Benchmark</p>\n' * 3
+        + '<p>*** START OF THE PROJECT GUTENBERG EBOOK BENCHMARK ***</p>\n'
+        + '<div class="toc">\n<h2>CONTENTS</h2>\n' + toc + '</div>\n'
+        + ''.join(body)
+        + '<p>*** END OF THE PROJECT GUTENBERG EBOOK BENCHMARK ***</p>\n</body></html>\n'
+    )
+
+
+def make_anthology(works: int, scenes: int = 25, toc: str = 'heading') -> str:
+    """A collected-works volume shaped like the Complete Works of Shakespeare.
+
+    toc: 'heading' (a "Contents" heading followed by links), 'none' (no
+    contents block at all - links only in the body), or 'unclosed' (a
+    toc container whose </div> is missing).
+    """
+    links = ''.join(f'<p><a href="#work{w}">WORK {w}</a></p>\n' for w in range(1, works + 1))
+    if toc == 'heading':
+        contents = '<h2>Contents</h2>\n' + links
+    elif toc == 'unclosed':
+        contents = '<div class="toc">\n' + links
+    else:
+        contents = ''
+    body = []
+    for w in range(1, works + 1):
+        body.append(f'<h2 id="work{w}">WORK {w}</h2>\n')
+        for n in range(1, scenes + 1):
+            body.append(f'<h3 id="w{w}s{n}">SCENE {roman(n).upper()}. A street.</h3>\n')
+            body.append(f'<p>Enter attendants. <a href="#w{w}s{n}">[{n}]</a></p>\n')
+            body.extend(f'<p>Speech {p} of scene {n}: the words, the words.</p>\n' for p in range(8))
+    return (
+        '<html><head><title>The Complete Works</title></head><body>\n<h1>The Complete Works</h1>\n'
+        + contents + ''.join(body) + '</body></html>\n'
+    )
+
+
+def make_gutenberg_book(size: int) -> str:
+    """A synthetic Project Gutenberg HTML book of about size bytes.
+
+    Mirrors the structure of current gutenberg.org files: pg-boilerplate
+    header and footer with the START/END markers, a toc div linking every
+    chapter, chapter divs with ids, pagenum spans, footnote links and images.
+    """
+    paragraph = ('<p>It was a <i>long</i> voyage, and the sea kept its own counsel; '
+                 'we spoke of home, of the weather, of <b>everything</b> but the wreck.</p>\n')
+    chapters = max(1, size // 20000)
+
+    def chapter(n: int) -> str:
+        parts = [f'<div class="chapter" id="chapter-{n}">\n<h2>CHAPTER {roman(n).upper()}.</h2>\n']
+        for p in range(1, 60):
+            if p % 15 == 0:
+                parts.append(f'<p><span class="pagenum"><a id="Page_{n * 4 + p // 15}">[{n * 4 + p // 15}]</a></span>'
+                             f'See the note.<a href="#note-{n}-{p}">[{p}]</a></p>\n')
+            elif p % 29 == 0:
+                parts.append(f'<div class="figcenter"><img src="images/i{n:04d}.jpg" alt="Plate {n}" /></div>\n')
+            else:
+                parts.append(paragraph)
+        parts.append('</div>\n')
+        return ''.join(parts)
+
+    head = (
+        '<!DOCTYPE html>\n<html><head>\n<title>The Project Gutenberg eBook of Synthetic Voyages</title>\n'
+        '<meta name="dc.title" content="Synthetic Voyages">\n<meta name="dc.creator" content="Bench, Mark">\n'
+        '</head><body>\n<section class="pg-boilerplate pgheader" id="pg-header">\n'
+        '<p>Title: Synthetic Voyages</p>\n<p>Author: Mark Bench</p>\n<p>Release Date: January 1, 2000 [eBook #99999]</p>\n'
+        '<p>Language: English</p>\n'
+        '<div id="pg-start-separator"><span>*** START OF THE PROJECT GUTENBERG EBOOK SYNTHETIC VOYAGES ***</span></div>\n'
+        '</section>\n<h1>SYNTHETIC VOYAGES</h1>\n<div class="toc">\n<h2>CONTENTS</h2>\n'
+        + ''.join(f'<p><a href="#chapter-{n}">CHAPTER {roman(n).upper()}.</a></p>\n' for n in range(1, chapters + 1))
+        + '</div>\n'
+    )
+    tail = (
+        '<section class="pg-boilerplate pgfooter" id="pg-footer">\n'
+        '<div id="pg-end-separator"><span>*** END OF THE PROJECT GUTENBERG EBOOK SYNTHETIC VOYAGES ***</span></div>\n'
+        '<p>Updated editions will replace the previous one.</p>\n</section>\n</body></html>\n'
+    )
+    body = []
+    total = len(head) + len(tail)
+    n = 0
+    while total < size or n < chapters:
+        n += 1
+        body.append(chapter(n))
+        total += len(body[-1])
+    return head + ''.join(body) + tail
+
+
+# =============================================================================
+# Reference Implementations (pattern loops, before the compiled classifiers)
+# =============================================================================
+
+def loop_is_chapter_heading(text: str) -> Tuple[bool, str]:
+    text_clean = text.strip().lower()
+    text_clean = re.sub(r'<[^>]+>', '', text_clean)
+    text_clean = re.sub(r'\s+', ' ', text_clean).strip()
+    for pattern in gx.CHAPTER_PATTERNS:
+        if re.match(pattern, text_clean, re.IGNORECASE):
+            return True, 'chapter'
+    for keyword in gx.FRONT_MATTER_KEYWORDS:
+        if text_clean == keyword or text_clean.startswith(keyword + ' ') or text_clean.endswith(' ' + keyword):
+            if 'contents' in keyword or 'table' in keyword:
+                return True, 'toc'
+            return True, 'front_matter'
+    for keyword in gx.BACK_MATTER_KEYWORDS:
+        if text_clean == keyword or text_clean.startswith(keyword + ' '):
+            return True, 'back_matter'
+    return False, ''
+
+
+def loop_is_section_id(element_id: str, toc_anchors: List[str] = None) -> Tuple[bool, str]:
+    id_lower = element_id.lower()
+    if any(skip in id_lower for skip in ['gutenberg', 'license', 'pg-', 'boilerplate']):
+        return False, ''
+    if toc_anchors and element_id in toc_anchors:
+        if any(kw in id_lower for kw in ['preface', 'introduction', 'foreword', 'prologue', 'dedication']):
+            return True, 'front_matter'
+        if any(kw in id_lower for kw in ['epilogue', 'afterword', 'appendix', 'notes', 'index', 'glossary']):
+            return True, 'back_matter'
+        if 'content' in id_lower or 'toc' in id_lower:
+            return True, 'toc'
+        return True, 'chapter'
+    chapter_id_patterns = [
+        r'^chapter[-_]?[ivxlcdm\d]+', r'^chap[-_]?[ivxlcdm\d]+', r'^ch[-_]?[ivxlcdm\d]+',
+        r'^letter[-_]?[ivxlcdm\d]+', r'^book[-_]?[ivxlcdm\d]+', r'^part[-_]?[ivxlcdm\d]+',
+        r'^volume[-_]?[ivxlcdm\d]+', r'^[ivxlcdm]+$', r'^\d+$',
+    ]
+    for pattern in chapter_id_patterns:
+        if re.match(pattern, id_lower):
+            return True, 'chapter'
+    if any(kw in id_lower for kw in ['preface', 'introduction', 'foreword', 'prologue', 'dedication']):
+        return True, 'front_matter'
+    if any(kw in id_lower for kw in ['epilogue', 'afterword', 'appendix', 'index', 'glossary', 'bibliography']):
+        return True, 'back_matter'
+    if 'content' in id_lower or 'toc' in id_lower:
+        return True, 'toc'
+    return False, ''
+
+
+def loop_remove_boilerplate(html_text: str) -> str:
+    lines = html_text.split('\n')
+    start_line, end_line = 0, len(lines)
+    for i, line in enumerate(lines):
+        line_upper = line.upper()
+        if any(marker.upper() in line_upper for marker in gx.START_MARKERS):
+            start_line = i + 1
+            break
+    for i in range(max(gx.FOOTER_MIN_LINE, start_line), len(lines)):
+        line_upper = lines[i].upper()
+        if any(marker.upper() in line_upper for marker in gx.END_MARKERS):
+            end_line = i
+            break
+    return '\n'.join(lines[start_line:end_line])
+
+
+def regex_extract_toc_anchors(html_text: str) -> List[str]:
+    toc_patterns = [
+        r'<(?:div|nav|section)[^>]*(?:class|id)=["\'][^"\']*(?:toc|contents)[^"\']*["\'][^>]*>.*?</(?:div|nav|section)>',
+        r'<h[1-4][^>]*>.*?(?:contents|table of contents).*?</h[1-4]>.*?(?=<h[1-4])',
+    ]
+    toc_html = None
+    for pattern in toc_patterns:
+        match = re.search(pattern, html_text, re.IGNORECASE | re.DOTALL)
+        if match:
+            toc_html = match.group(0)
+            break
+    if not toc_html:
+        toc_html = html_text
+    anchors = []
+    for anchor in re.findall(r'<a[^>]+href=["\']#([^"\']+)["\'][^>]*>', toc_html, re.IGNORECASE):
+        if any(skip in anchor.lower() for skip in ['note', 'footnote', 'pg-', 'gutenberg']):
+            continue
+        if anchor not in anchors:
+            anchors.append(anchor)
+    return anchors
+
+
+def regex_extract_html_meta(html_text: str) -> Dict[str, List[str]]:
+    meta_patterns = {
+        'title': r'<meta\s+name="dc\.title"\s+content="([^"]+)"',
+        'author': r'<meta\s+name="dc\.creator"\s+content="([^"]+)"',
+        'language': r'<meta\s+name="dc\.language"\s+content="([^"]+)"',
+        'rights': r'<meta\s+name="dc\.rights"\s+content="([^"]+)"',
+        'subject': r'<meta\s+name="dc\.subject"\s+content="([^"]+)"',
+    }
+    meta = {key: re.findall(pattern, html_text, re.IGNORECASE) for key, pattern in meta_patterns.items()}
+    title_match = re.search(r'<title>([^<]+)</title>', html_text, re.IGNORECASE)
+    meta['page_title'] = [title_match.group(1)] if title_match else []
+    return meta
+
+
+def loop_dedupe(anchors: List[str]) -> List[str]:
+    result = []
+    for anchor in anchors:
+        if anchor not in result:
+            result.append(anchor)
+    return result
+
+
+# =============================================================================
+# Benchmarks
+# =============================================================================
+
+def best_time(func: Callable, repeat: int) -> float:
+    """Best wall time of several runs (the least noisy estimate)."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def compare(name: str, reference: Callable, optimized: Callable, repeat: int,
+            check: bool = True) -> Dict:
+    """Time two implementations; with check, both must give the same answer."""
+    if check and optimized() != reference():
+        print(f"  ERROR: {name}: results differ from the reference implementation")
+        sys.exit(1)
+    before = best_time(reference, repeat)
+    after = best_time(optimized, repeat)
+    print(f"  {name:<30} {before * 1000:9.2f} ms  {after * 1000:9.2f} ms  {before / after:6.2f}x")
+    return {'name': name, 'before': before, 'after': after}
+
+
+def bench_classifiers(chapters: int, repeat: int) -> List[Dict]:
+    """Loop-based vs compiled classification of headings, IDs and markers."""
+    headings = make_headings(chapters * 4)
+    element_ids = make_element_ids(chapters)
+    toc_anchors = [f'chapter-{n}' for n in range(1, chapters + 1)]
+    html = make_book(chapters)
+
+    print(f"\nClassifiers ({len(headings)} headings, {len(element_ids)} element IDs, "
+          f"{len(html) / 1024 / 1024:.1f} MB book)")
+    print(f"  {'':<30} {'before':>12}  {'after':>12}  speedup")
+    return [
+        compare('is_chapter_heading',
+                lambda: [loop_is_chapter_heading(h) for h in headings],
+                lambda: [gx.is_chapter_heading(h) for h in headings], repeat),
+        compare('is_section_id',
+                lambda: [loop_is_section_id(i) for i in element_ids],
+                lambda: [gx.is_section_id(i) for i in element_ids], repeat),
+        compare('is_section_id (TOC anchors)',
+                lambda: [loop_is_section_id(i, toc_anchors[:50]) for i in element_ids],
+                lambda: [gx.is_section_id(i, toc_anchors[:50]) for i in element_ids], repeat),
+        compare('remove_gutenberg_boilerplate',
+                lambda: loop_remove_boilerplate(html),
+                lambda: gx.remove_gutenberg_boilerplate(html), repeat),
+    ]
+
+
+def registry_is_section_id(element_id: str, registry) -> Tuple[bool, str]:
+    """GutenbergHTMLParser._check_element_id: TOC registry lookup, then ID patterns."""
+    section_type = registry.section_type(element_id)
+    if section_type is not None:
+        return bool(section_type), section_type
+    return gx.is_section_id(element_id)
+
+
+def registry_check_ids(element_ids: List[str], anchor_list: List[str]) -> List[Tuple[bool, str]]:
+    registry = gx.TOCAnchors(anchor_list)
+    return [registry_is_section_id(i, registry) for i in element_ids]
+
+
+def bench_toc_lookup(chapters: int, repeat: int) -> List[Dict]:
+    """List-scan vs hash-indexed TOC anchors when checking every element ID."""
+    anchor_list = [f'chapter-{n}' for n in range(1, chapters + 1)]
+    element_ids = make_element_ids(chapters)[:20000]
+
+    print(f"\nTOC anchors ({len(anchor_list)} anchors, {len(element_ids)} element IDs)")
+    print(f"  {'':<30} {'before':>12}  {'after':>12}  speedup")
+    return [
+        compare('extract anchors (dedupe)',
+                lambda: loop_dedupe(anchor_list * 2),
+                lambda: list(gx.TOCAnchors(anchor_list * 2)), repeat),
+        compare('check element IDs',
+                lambda: [loop_is_section_id(i, anchor_list) for i in element_ids],
+                lambda: registry_check_ids(element_ids, anchor_list), repeat),
+    ]
+
+
+def bench_toc_locator(works: int, repeat: int, html_file: str = None) -> List[Dict]:
+    """Backtracking TOC regexes vs the tokenizer-based TOCLocator.
+
+    The regexes find a different (and often wrong) region, so only times are
+    compared. The locator must also scale linearly: doubling the input may
+    at most triple its time, otherwise the run fails.
+    """
+    corpora = [(f'anthology, {kind} toc', make_anthology(works, toc=kind))
+               for kind in ('heading', 'none', 'unclosed')]
+    if html_file:
+        corpora.append((Path(html_file).name, Path(html_file).read_text(encoding='utf-8', errors='replace')))
+
+    print(f"\nTOC locator ({works} works, {len(corpora[0][1]) / 1024 / 1024:.1f} MB anthology)")
+    print(f"  {'':<30} {'regex':>12}  {'locator':>12}  speedup")
+    results = [compare(name, lambda html=html: regex_extract_toc_anchors(html),
+                       lambda html=html: gx.extract_toc_anchors(html), repeat, check=False)
+               for name, html in corpora]
+
+    single = best_time(lambda: gx.extract_toc_anchors(make_anthology(works, toc='none')), repeat)
+    double = best_time(lambda: gx.extract_toc_anchors(make_anthology(works * 2, toc='none')), repeat)
+    print(f"  locator time for 2x the input: {double / single:.1f}x")
+    if double / single > 3:
+        print("  ERROR: TOC locator is not scaling linearly")
+        sys.exit(1)
+    return results
+
+
+# =============================================================================
+# Throughput Suite
+# =============================================================================
+
+SUITE_SIZES = ['100K', '1M', '10M', '100M']
+STAGES = ['boilerplate', 'toc', 'multipass', 'parse', 'write']
+
+
+def parse_size(text: str) -> int:
+    """'100K' / '10M' / '12345' -> bytes."""
+    units = {'K': 1024, 'M': 1024 * 1024}
+    text = text.strip().upper()
+    if text[-1:] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_stages(size: int, repeat: int) -> Dict:
+    """Time every stage on one synthetic book (run in a fresh process)."""
+    html = make_gutenberg_book(size)
+    stages = {}
+
+    def measure_together(funcs):
+        # Stages to compare run in turn, run by run, so a slow spell of the
+        # machine hits them alike, and each run starts with the previous
+        # result freed; returns the last stage's result
+        best = {}
+        result = None
+        for _ in range(repeat):
+            for name, func in funcs.items():
+                result = None
+                started = time.perf_counter()
+                result = func()
+                elapsed = time.perf_counter() - started
+                best[name] = min(best.get(name, elapsed), elapsed)
+        for name, seconds in best.items():
+            stages[name] = {'seconds': seconds, 'mb_per_s': len(html) / 1024 / 1024 / seconds}
+        return result
+
+    def measure(name, func):
+        return measure_together({name: func})
+
+    measure('boilerplate', lambda: gx.remove_gutenberg_boilerplate(html))
+    measure('toc', lambda: gx.extract_toc_anchors(html))
+
+    def multipass():
+        # The pipeline the single pass replaced: read the meta tags and find
+        # the TOC with regexes, strip the boilerplate line by line, then parse
+        # the cleaned text
+        regex_extract_html_meta(html)
+        parser = gx.GutenbergHTMLParser(regex_extract_toc_anchors(html))
+        parser.feed(loop_remove_boilerplate(html))
+        parser.close()
+        return parser.get_results()
+
+    def parse():
+        parser = gx.GutenbergHTMLParser(single_pass=True)
+        parser.feed(html)
+        parser.close()
+        return parser.get_results()
+    front_matter, chapters, _ = measure_together({'multipass': multipass, 'parse': parse})
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        measure('write', lambda: gx.save_markdown_files(front_matter, chapters, Path(tmp), {'author': 'Mark Bench'}))
+
+    return {'bytes': len(html), 'sections': len(front_matter) + len(chapters),
+            'stages': stages, 'peak_rss_mb': peak_rss_mb()}
+
+
+def run_suite(sizes: List[str], repeat: int) -> Dict:
+    """Run each size in its own process, so peak RSS is per size."""
+    results = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'sizes': {},
+    }
+    print(f"\nThroughput suite (synthetic Gutenberg books, best of {repeat})")
+    print(f"  {'size':>6} {'stage':<12} {'time':>10} {'MB/s':>8}")
+    for label in sizes:
+        runs = repeat if parse_size(label) <= 10 * 1024 * 1024 else 1
+        proc = subprocess.run([sys.executable, __file__, '--run-size', str(parse_size(label)),
+                               '--repeat', str(runs)], capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"  ERROR: {label}: {proc.stderr.strip()}")
+            sys.exit(1)
+        result = json.loads(proc.stdout)
+        results['sizes'][label] = result
+        for stage in STAGES:
+            timing = result['stages'][stage]
+            print(f"  {label:>6} {stage:<12} {timing['seconds'] * 1000:8.1f}ms {timing['mb_per_s']:8.2f}")
+        rss = result['peak_rss_mb']
+        print(f"  {label:>6} {'peak RSS':<12} {rss:8.1f}MB" if rss is not None else f"  {label:>6} peak RSS n/a")
+    return results
+
+
+def compare_pipelines(results: Dict) -> List[str]:
+    """List sizes where the single-pass parse is slower than the multi-pass pipeline.
+
+    The single pass does the meta tag, boilerplate, TOC and parse passes of
+    the multi-pass pipeline in one scan, so it must not cost more than all
+    of them: there is no slack.
+    """
+    regressions = []
+    for label, result in results['sizes'].items():
+        before = result['stages']['multipass']['seconds']
+        after = result['stages']['parse']['seconds']
+        if after > before:
+            regressions.append(f"{label} single-pass parse: {after * 1000:.1f}ms "
+                               f"vs {before * 1000:.1f}ms for the multi-pass pipeline")
+    return regressions
+
+
+def compare_baseline(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """List stage times and peak RSS that regressed by more than threshold."""
+    regressions = []
+    for label, result in results['sizes'].items():
+        base = baseline.get('sizes', {}).get(label)
+        if not base:
+            continue
+        for stage, timing in result['stages'].items():
+            before = base['stages'].get(stage, {}).get('seconds')
+            if before and timing['seconds'] > before * (1 + threshold):
+                regressions.append(f"{label} {stage}: {before * 1000:.1f}ms -> {timing['seconds'] * 1000:.1f}ms")
+        before_rss = base.get('peak_rss_mb')
+        if before_rss and result['peak_rss_mb'] and result['peak_rss_mb'] > before_rss * (1 + threshold):
+            regressions.append(f"{label} peak RSS: {before_rss:.1f}MB -> {result['peak_rss_mb']:.1f}MB")
+    return regressions
+
+
+# =============================================================================
+# Main Entry Point
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark gutenberg-extraction.py on a synthetic book',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--chapters', type=int, default=2000,
+                        help='Chapters in the synthetic heading-heavy book (default: 2000)')
+    parser.add_argument('--works', type=int, default=15,
+                        help='Works in the synthetic anthology for the TOC locator (default: 15)')
+    parser.add_argument('--html', metavar='FILE',
+                        help='Also time the TOC locator on a real book, e.g. pg100-images.html')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Runs per measurement; the best is reported (default: 5, suite: 3)')
+    parser.add_argument('--suite', action='store_true',
+                        help='Run the throughput suite instead of the micro-benchmarks; exit 1 if the '
+                             'single-pass parse is slower than the multi-pass pipeline')
+    parser.add_argument('--sizes', default=','.join(SUITE_SIZES),
+                        help=f'Suite book sizes (default: {",".join(SUITE_SIZES)})')
+    parser.add_argument('--baseline', metavar='FILE',
+                        help='Compare suite results with a saved baseline; exit 1 on regressions')
+    parser.add_argument('--save-baseline', metavar='FILE',
+                        help='Save suite results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed slowdown / memory growth over the baseline (default: 0.25 = 25%%)')
+    parser.add_argument('--run-size', type=int, help=argparse.SUPPRESS)  # suite worker process
+    args = parser.parse_args()
+
+    if args.run_size:
+        print(json.dumps(run_stages(args.run_size, args.repeat)))
+        return
+
+    if args.suite:
+        repeat = args.repeat if '--repeat' in sys.argv else 3
+        results = run_suite([size for size in args.sizes.split(',') if size], repeat)
+        if args.save_baseline:
+            with open(args.save_baseline, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"\n  ✓ Baseline saved to {args.save_baseline}")
+        failed = False
+        regressions = compare_pipelines(results)
+        if regressions:
+            print("\nSingle-pass parse slower than the multi-pass pipeline:")
+            for regression in regressions:
+                print(f"  ✗ {regression}")
+            failed = True
+        else:
+            print("\n  ✓ Single-pass parse no slower than the multi-pass pipeline")
+        if args.baseline:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+            regressions = compare_baseline(results, baseline, args.threshold)
+            if regressions:
+                print(f"\nRegressions beyond {args.threshold:.0%} of {args.baseline}:")
+                for regression in regressions:
+                    print(f"  ✗ {regression}")
+                failed = True
+            else:
+                print(f"\n  ✓ No regressions beyond {args.threshold:.0%} of {args.baseline}")
+        if failed:
+            sys.exit(1)
+        return
+
+    bench_classifiers(args.chapters, args.repeat)
+    bench_toc_lookup(args.chapters // 2, args.repeat)
+    bench_toc_locator(args.works, args.repeat, args.html)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,10 +9,11 @@ A robust script for extracting book data from Project Gutenberg, including:
 - A 000-data.yml file with comprehensive book metadata
 
 Usage:
-    python gutenberg-extraction.py <book_id> [options]
+    python gutenberg-extraction.py <book_id> [<book_id> ...] [options]
 
 Example:
     python gutenberg-extraction.py 64317 --output ./books
+    python gutenberg-extraction.py --ids-file shelf.txt --workers 8
 """
 
 import re
@@ -21,14 +22,40 @@ import sys
 import json
 import argparse
 import time
+import codecs
+import hashlib
+import tempfile
+import threading
+import ssl
+import zlib
+import mmap
+import random
+import email.utils
+import sqlite3
+import tarfile
+import zipfile
+import shutil
+import stat
+import subprocess
+import contextlib
+import cProfile
+import pstats
+import tracemalloc
+import http.client
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from pathlib import Path
-from urllib.request import urlopen, Request
-from urllib.error import URLError, HTTPError
-from urllib.parse import urljoin, urlparse
+from urllib.request import url2pathname
+from urllib.parse import urljoin, urlparse, quote, unquote
 from html.parser import HTMLParser
-from datetime import datetime
+from datetime import datetime, timezone
 import html
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any, Callable
+
+try:
+    from PIL import Image as PILImage  # optional: image derivatives (--derivatives)
+except ImportError:
+    PILImage = None
 
 
 # =============================================================================
@@ -40,9 +67,12 @@ GUTENBERG_URLS = {
     'html_images': 'https://www.gutenberg.org/cache/epub/{id}/pg{id}-images.html',
     'html_simple': 'https://www.gutenberg.org/files/{id}/{id}-h/{id}-h.htm',
     'html_alt': 'https://www.gutenberg.org/files/{id}/{id}-h.htm',
+    'html_zip': 'https://www.gutenberg.org/files/{id}/{id}-h.zip',  # HTML + images in one archive
+    'html_zip_generated': 'https://www.gutenberg.org/cache/epub/{id}/pg{id}-h.zip',
     'cover_medium': 'https://www.gutenberg.org/cache/epub/{id}/pg{id}.cover.medium.jpg',
     'cover_small': 'https://www.gutenberg.org/cache/epub/{id}/pg{id}.cover.small.jpg',
     'rdf': 'https://www.gutenberg.org/ebooks/{id}.rdf',
+    'rdf_catalog': 'https://www.gutenberg.org/cache/epub/feeds/rdf-files.tar.bz2',  # whole catalog
     'json_metadata': 'https://gutendex.com/books/{id}/',  # Third-party API with rich metadata
     'book_page': 'https://www.gutenberg.org/ebooks/{id}',
 }
@@ -58,7 +88,65 @@ HEADERS = {
 
 # Retry configuration
 MAX_RETRIES = 3
-RETRY_DELAY = 2  # seconds
+RETRY_DELAY = 2  # seconds; base of the exponential backoff between retries
+MAX_BACKOFF = 60  # seconds
+MAX_RETRY_AFTER = 300  # longest Retry-After (seconds) honored as given
+MAX_RESUMES = 5  # Range requests to continue one interrupted download
+
+# Per-host politeness (see HostScheduler)
+HOST_RATE = 4.0  # requests per second per host; 0 disables the rate limit
+HOST_BURST = 8  # requests a host may get back to back after a quiet spell
+HOST_INITIAL_CONCURRENCY = 4  # requests in flight per host, adjusted from here
+HOST_MAX_CONCURRENCY = 8
+SLOW_RESPONSE_FACTOR = 4  # a response this many times slower than the host's best counts as congestion
+CIRCUIT_FAILURES = 5  # consecutive failures that open a host's circuit breaker
+CIRCUIT_COOLDOWN = 30  # seconds before a probe request; doubles while the host stays down
+MAX_CIRCUIT_COOLDOWN = 600
+
+# Connection pool configuration
+MAX_IDLE_CONNECTIONS = 8  # idle keep-alive connections kept per host
+MAX_REDIRECTS = 5
+CHUNK_SIZE = 64 * 1024  # bytes read from the socket at a time
+
+# Batch configuration
+DEFAULT_WORKERS = 4  # concurrent books in batch mode
+DEFAULT_IMAGE_WORKERS = 4  # concurrent image downloads per book
+
+# Image derivatives (--derivatives), as CollectionBuilder's generate_derivatives task makes them
+DERIVATIVES = {  # folder -> (filename suffix, max width, max height)
+    'thumbs': ('_th', 450, None),
+    'small': ('_sm', 800, 800),
+}
+DERIVATIVE_SOURCE_TYPES = ('.jpg', '.jpeg', '.png', '.gif', '.tif', '.tiff')
+DERIVATIVE_QUALITY = 85
+DEFAULT_DERIVATIVE_WORKERS = os.cpu_count() or 2
+
+# HTTP cache configuration
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'gutenberg-extraction'
+DEFAULT_CACHE_MAX_MB = 2048  # LRU eviction above this size
+DEFAULT_CACHE_TTL = 24 * 3600  # seconds a response is reused without revalidation
+
+# Local gutenberg.org mirror (--mirror-root): hosts whose URLs it answers
+MIRROR_HOSTS = ('www.gutenberg.org', 'gutenberg.org')
+
+# Content-addressed image store shared by all books and runs
+DEFAULT_IMAGE_STORE = DEFAULT_CACHE_DIR / 'images'
+
+# Offline catalog index (built with --ingest-catalog)
+DEFAULT_CATALOG_DB = DEFAULT_CACHE_DIR / 'catalog.sqlite'
+
+# Incremental re-extraction
+PARSER_VERSION = 1  # bump when parsing or rendering changes, so manifests no longer match
+MANIFEST_DIR = '.gutenberg-manifest'  # per-book manifests, under the output base / project root
+EXTRACTED_AT_RE = re.compile(rb'^extracted_at: .*$', re.MULTILINE)  # not a change on its own
+
+# Progress journal (--resume)
+JOURNAL_DIR = '.gutenberg-journal'  # next to MANIFEST_DIR: journal.jsonl + fetched HTML
+JOURNAL_STAGES = ('fetched', 'parsed', 'written')
+
+# Profiling (--profile)
+PROFILE_STAGES = ('metadata', 'download', 'images', 'parse', 'write')
+PROFILE_TOP = 20  # hot functions / allocation sites listed in the report
 
 # Text-based boilerplate markers (per extraction guide)
 START_MARKERS = [
@@ -102,11 +190,114 @@ BACK_MATTER_KEYWORDS = [
     'glossary', 'index', 'bibliography', 'about the author',
 ]
 
+# Line limits for text-marker scans (raw HTML lines, 1-based)
+HEADER_SCAN_LINES = 150  # body-text metadata ("Title:", "Author:") lives in the header
+FOOTER_MIN_LINE = 100  # END markers before this line are false positives
+
 
 # =============================================================================
 # Boilerplate Removal (Text-based, per extraction guide)
 # =============================================================================
 
+# Longest marker minus one: enough trailing text to catch a marker split in two
+MARKER_TAIL_CHARS = max(len(m) for m in START_MARKERS + END_MARKERS) - 1
+
+
+def compile_classifier(rules: List[Tuple[str, str]]) -> re.Pattern:
+    """Compile (section_type, regex) rules into one classifier.
+
+    Each rule becomes a named group of a single alternation, tried in order at
+    the start of the text, so match().lastgroup is the section type of the
+    first rule that applies - one regex call instead of a loop over pattern
+    and keyword lists.
+    """
+    return re.compile('|'.join(f'(?P<{name}>(?:{pattern}))' for name, pattern in rules), re.DOTALL)
+
+
+def classify(classifier: re.Pattern, text: str) -> str:
+    """Return the section type a compiled classifier assigns to text, or ''."""
+    match = classifier.match(text)
+    return match.lastgroup if match else ''
+
+
+def find_marker(text_upper: str, markers_upper: Tuple[str, ...], start: int = 0) -> int:
+    """Return the position of the first marker in upper-cased text, or -1."""
+    best = -1
+    for marker in markers_upper:
+        pos = text_upper.find(marker, start)
+        if pos >= 0 and (best < 0 or pos < best):
+            best = pos
+    return best
+
+
+def keyword_alternation(keywords: List[str]) -> str:
+    return '(?:' + '|'.join(re.escape(keyword) for keyword in keywords) + ')'
+
+
+def contains_any(keywords: List[str]) -> str:
+    """Rule pattern: the text contains one of the keywords."""
+    return f'(?=.*?{keyword_alternation(keywords)})'
+
+
+def keyword_words(keywords: List[str], trailing: bool = True) -> str:
+    """Rule pattern: the text is, starts with (or ends with) one of the keywords."""
+    alt = keyword_alternation(keywords)
+    if trailing:
+        return f'(?={alt}(?: |$)|.* {alt}$)'
+    return f'(?={alt}(?: |$))'
+
+
+# Markers are matched against upper-cased text; str.find per marker beats a
+# regex alternation here (it is a fast C substring search)
+START_MARKERS_UPPER = tuple(marker.upper() for marker in START_MARKERS)
+END_MARKERS_UPPER = tuple(marker.upper() for marker in END_MARKERS)
+# Every START marker contains "START OF" or "END*THE SMALL PRINT" and every END
+# marker "END OF", so upper-cased text that holds none of these is passed over
+# without searching it for each marker. (A case-insensitive regex would do the
+# same test several times slower: it cannot use the C substring search.)
+START_MARKER_GATE = ('START OF', 'END*THE SMALL PRINT')
+END_MARKER_GATE = 'END OF'
+
+# Heading text (lower-cased): chapter patterns, then front matter keywords
+# (whole text, first word(s) or last word(s)), then back matter keywords
+TOC_KEYWORDS = [kw for kw in FRONT_MATTER_KEYWORDS if 'contents' in kw or 'table' in kw]
+HEADING_CLASSIFIER = compile_classifier([
+    ('chapter', '|'.join(pattern.lstrip('^') for pattern in CHAPTER_PATTERNS)),
+    ('front_matter', keyword_words([kw for kw in FRONT_MATTER_KEYWORDS if kw not in TOC_KEYWORDS])),
+    ('toc', keyword_words(TOC_KEYWORDS)),
+    ('back_matter', keyword_words(BACK_MATTER_KEYWORDS, trailing=False)),
+])
+
+# Element IDs (lower-cased)
+SECTION_ID_SKIP_RE = re.compile('gutenberg|license|pg-|boilerplate')
+TOC_LINK_SKIP_RE = re.compile('note|footnote|pg-|gutenberg')  # non-chapter link targets
+CHAPTER_ID_PATTERNS = [
+    r'chapter[-_]?[ivxlcdm\d]+',
+    r'chap[-_]?[ivxlcdm\d]+',
+    r'ch[-_]?[ivxlcdm\d]+',
+    r'letter[-_]?[ivxlcdm\d]+',
+    r'book[-_]?[ivxlcdm\d]+',
+    r'part[-_]?[ivxlcdm\d]+',
+    r'volume[-_]?[ivxlcdm\d]+',
+    r'[ivxlcdm]+$',  # Pure roman numerals
+    r'\d+$',  # Pure numbers
+]
+FRONT_MATTER_ID_KEYWORDS = ['preface', 'introduction', 'foreword', 'prologue', 'dedication']
+# IDs linked from the TOC: typed by keyword, anything else is a chapter
+TOC_ANCHOR_ID_CLASSIFIER = compile_classifier([
+    ('front_matter', contains_any(FRONT_MATTER_ID_KEYWORDS)),
+    ('back_matter', contains_any(['epilogue', 'afterword', 'appendix', 'notes', 'index', 'glossary'])),
+    ('toc', contains_any(['content', 'toc'])),
+])
+# Other IDs: only recognizable chapter/front/back matter names are sections
+SECTION_ID_CLASSIFIER = compile_classifier([
+    ('chapter', '|'.join(CHAPTER_ID_PATTERNS)),
+    ('front_matter', contains_any(FRONT_MATTER_ID_KEYWORDS)),
+    ('back_matter', contains_any(['epilogue', 'afterword', 'appendix', 'index', 'glossary', 'bibliography'])),
+    ('toc', contains_any(['content', 'toc'])),
+])
+
+
 def remove_gutenberg_boilerplate(html_text: str) -> str:
     """Remove Project Gutenberg header and footer boilerplate using text markers.
 
@@ -114,23 +305,28 @@ def remove_gutenberg_boilerplate(html_text: str) -> str:
     are consistent across all eras of digitization.
     """
     lines = html_text.split('\n')
+    # One upper-cased copy searched as a whole instead of line by line
+    # (upper() may change lengths, so positions are only used to count lines)
+    text_upper = html_text.upper()
 
     start_line = 0
     end_line = len(lines)
 
     # Find content start (after header) - case insensitive
-    for i, line in enumerate(lines):
-        line_upper = line.upper()
-        if any(marker.upper() in line_upper for marker in START_MARKERS):
-            start_line = i + 1
-            break
+    pos = find_marker(text_upper, START_MARKERS_UPPER)
+    if pos >= 0:
+        start_line = text_upper.count('\n', 0, pos) + 1
 
     # Find content end (before footer) - only check after line 100 to avoid false positives
-    for i in range(max(100, start_line), len(lines)):
-        line_upper = lines[i].upper()
-        if any(marker.upper() in line_upper for marker in END_MARKERS):
-            end_line = i
+    offset = 0
+    for _ in range(max(FOOTER_MIN_LINE, start_line)):
+        offset = text_upper.find('\n', offset) + 1
+        if not offset:
             break
+    if offset:
+        pos = find_marker(text_upper, END_MARKERS_UPPER, offset)
+        if pos >= 0:
+            end_line = text_upper.count('\n', 0, pos)
 
     return '\n'.join(lines[start_line:end_line])
 
@@ -144,7 +340,7 @@ def extract_metadata_from_body_text(html_text: str) -> Dict[str, Any]:
     metadata = {}
 
     # Only look in the first ~150 lines for header metadata
-    header_text = '\n'.join(html_text.split('\n')[:150])
+    header_text = '\n'.join(html_text.split('\n', HEADER_SCAN_LINES)[:HEADER_SCAN_LINES])
 
     # Title pattern
     title_match = re.search(r'Title:\s*(.+?)(?:\n|Author:|Release)', header_text, re.IGNORECASE)
@@ -186,131 +382,1293 @@ def extract_metadata_from_body_text(html_text: str) -> Dict[str, Any]:
     return metadata
 
 
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
 def is_chapter_heading(text: str) -> Tuple[bool, str]:
     """Check if text is a chapter heading and return the type.
 
     Returns (is_chapter, section_type) tuple.
     """
-    text_clean = text.strip().lower()
-    text_clean = re.sub(r'<[^>]+>', '', text_clean)  # Remove any HTML tags
-    text_clean = re.sub(r'\s+', ' ', text_clean).strip()
+    text_clean = HTML_TAG_RE.sub('', text.strip().lower())  # Remove any HTML tags
+    text_clean = WHITESPACE_RE.sub(' ', text_clean).strip()
 
-    # Check for chapter patterns
-    for pattern in CHAPTER_PATTERNS:
-        if re.match(pattern, text_clean, re.IGNORECASE):
-            return True, 'chapter'
+    section_type = classify(HEADING_CLASSIFIER, text_clean)
+    return bool(section_type), section_type
 
-    # Check for front matter
-    for keyword in FRONT_MATTER_KEYWORDS:
-        if text_clean == keyword or text_clean.startswith(keyword + ' ') or text_clean.endswith(' ' + keyword):
-            if 'contents' in keyword or 'table' in keyword:
-                return True, 'toc'
-            return True, 'front_matter'
 
-    # Check for back matter
-    for keyword in BACK_MATTER_KEYWORDS:
-        if text_clean == keyword or text_clean.startswith(keyword + ' '):
-            return True, 'back_matter'
+def toc_anchor_type(anchor: str) -> str:
+    """Section type of an element the TOC links to ('' for boilerplate IDs)."""
+    id_lower = anchor.lower()
+    if SECTION_ID_SKIP_RE.search(id_lower):
+        return ''
+    return classify(TOC_ANCHOR_ID_CLASSIFIER, id_lower) or 'chapter'
 
-    return False, ''
 
+class TOCAnchors:
+    """Ordered, hash-indexed registry of TOC anchor IDs.
 
-def extract_toc_anchors(html_text: str) -> List[str]:
-    """Extract anchor IDs from table of contents links.
-
-    This is the most reliable way to find chapter boundaries per the extraction guide.
-    TOC links like <a href="#chapter-1"> tell us exactly where sections are.
+    Keeps anchors in TOC order without duplicates, and classifies each
+    anchor's section type once when it is added, so checking an element ID
+    against the TOC is a dict lookup rather than a list scan.
     """
-    anchors = []
 
-    # Find TOC section (typically marked by "contents" class/id or heading)
-    # Look for anchor hrefs that start with #
-    # Pattern: href="#something" within what looks like a TOC
+    def __init__(self, anchors: List[str] = ()):
+        self._types: Dict[str, str] = {}
+        for anchor in anchors:
+            self.add(anchor)
 
-    # First, try to find TOC region by looking for "contents" markers
-    toc_patterns = [
-        r'<(?:div|nav|section)[^>]*(?:class|id)=["\'][^"\']*(?:toc|contents)[^"\']*["\'][^>]*>.*?</(?:div|nav|section)>',
-        r'<h[1-4][^>]*>.*?(?:contents|table of contents).*?</h[1-4]>.*?(?=<h[1-4])',
-    ]
+    def add(self, anchor: str) -> None:
+        if anchor not in self._types:
+            self._types[anchor] = toc_anchor_type(anchor)
 
-    toc_html = None
-    for pattern in toc_patterns:
-        match = re.search(pattern, html_text, re.IGNORECASE | re.DOTALL)
-        if match:
-            toc_html = match.group(0)
-            break
+    def section_type(self, anchor: str) -> Optional[str]:
+        """Return the anchor's section type ('' if it is not a section), or None if not in the TOC."""
+        return self._types.get(anchor)
+
+    def __contains__(self, anchor: str) -> bool:
+        return anchor in self._types
+
+    def __iter__(self):
+        return iter(self._types)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+
+# Cheap pre-checks for extract_toc_anchors(): the first tag that could open a
+# toc container, or a heading that could read "Contents". Every real one
+# matches, so nothing before the first match can be the TOC.
+TOC_CONTAINER_HINT_RE = re.compile(r'<(?:div|nav|section)\b[^>]*(?:toc|contents)', re.IGNORECASE)
+TOC_HEADING_HINT_RE = re.compile(r'<h[1-4]\b(?:(?!</?h[1-4]\b).)*?contents', re.IGNORECASE | re.DOTALL)
+TOC_SCAN_CHUNK = 1024  # first piece of text fed to the locator before checking for the end of the TOC
+
+
+class TOCLocator(HTMLParser):
+    """Find the table of contents from the document's tag structure.
 
-    # If no TOC section found, scan the whole document for likely TOC links
-    if not toc_html:
-        toc_html = html_text
+    Works token by token (one linear scan, no backtracking), so it can run
+    standalone via feed() or be driven by another parser through scan_starttag(),
+    scan_endtag() and scan_data(). Three candidate anchor sets are collected at
+    once: links inside a toc/contents container (div/nav/section, nesting
+    aware), links in the region after a "Contents" heading up to the next
+    heading, and every internal link in the book. The first one that exists
+    wins, in that order; see anchors.
+    """
 
-    # Extract all internal anchors (href="#...")
-    anchor_pattern = r'<a[^>]+href=["\']#([^"\']+)["\'][^>]*>'
-    matches = re.findall(anchor_pattern, toc_html, re.IGNORECASE)
+    HEADINGS = ('h1', 'h2', 'h3', 'h4')
+    CONTAINERS = ('div', 'nav', 'section')
 
-    for anchor in matches:
-        anchor_lower = anchor.lower()
+    def __init__(self):
+        super().__init__()
+        self.all_anchors = TOCAnchors()
+        self.container_anchors = TOCAnchors()
+        self.heading_anchors = TOCAnchors()
+        self._container_state = 0  # 0 = not seen, 1 = inside, 2 = closed
+        self._container_depth = 0
+        self._heading_state = 0
+        self._in_heading = False
+        self._heading_text = []
+
+    @property
+    def complete(self) -> bool:
+        """Whether a TOC block has been found and has ended."""
+        return self._container_state == 2 or self._heading_state == 2
+
+    @property
+    def anchors(self) -> TOCAnchors:
+        """The best TOC anchor set found so far."""
+        if self._container_state:
+            return self.container_anchors
+        if self._heading_state:
+            return self.heading_anchors
+        return self.all_anchors
+
+    def feed_block(self, html_text: str, start: int, container: bool) -> bool:
+        """Feed html_text from start until the TOC block found there has ended.
+
+        start must be at or before the first tag that can open the block: a
+        toc container if container is set, otherwise a "Contents" heading
+        (in a text that holds no toc container). Returns whether that block
+        was found; if not, the anchors only cover the text after start.
+        The pieces fed double in size, so at most about twice the text up
+        to the end of the block is tokenized.
+        """
+        pos, size = start, TOC_SCAN_CHUNK
+        while pos < len(html_text):
+            self.feed(html_text[pos:pos + size])
+            if self._container_state == 2 or (not container and self._heading_state == 2):
+                return True
+            pos += size
+            size *= 2
+        self.close()
+        return bool(self._container_state if container else self._heading_state)
+
+    def scan_starttag(self, tag: str, attrs_dict: Dict[str, Optional[str]]) -> None:
+        if tag == 'a':
+            href = attrs_dict.get('href') or ''
+            if href.startswith('#') and len(href) > 1:
+                self._add_anchor(href[1:])
+        elif tag in self.HEADINGS:
+            # A "Contents" heading region runs until the next heading
+            if self._heading_state == 1:
+                self._heading_state = 2
+            self._in_heading = True
+            self._heading_text = []
+        elif tag in self.CONTAINERS:
+            if self._container_state == 1:
+                self._container_depth += 1
+            elif self._container_state == 0:
+                names = f"{attrs_dict.get('class') or ''} {attrs_dict.get('id') or ''}".lower()
+                if 'toc' in names or 'contents' in names:
+                    self._container_state = 1
+                    self._container_depth = 1
+
+    def scan_endtag(self, tag: str) -> None:
+        if tag in self.HEADINGS and self._in_heading:
+            self._in_heading = False
+            heading_text = ''.join(self._heading_text).lower()
+            if 'contents' in heading_text and not self._heading_state and not self._container_state:
+                self._heading_state = 1
+        elif tag in self.CONTAINERS and self._container_state == 1:
+            self._container_depth -= 1
+            if self._container_depth <= 0:
+                self._container_state = 2
+
+    def scan_data(self, data: str) -> None:
+        if self._in_heading:
+            self._heading_text.append(data)
+
+    def _add_anchor(self, anchor: str) -> None:
         # Skip non-chapter anchors
-        if any(skip in anchor_lower for skip in ['note', 'footnote', 'pg-', 'gutenberg']):
-            continue
-        if anchor not in anchors:
-            anchors.append(anchor)
+        if TOC_LINK_SKIP_RE.search(anchor.lower()):
+            return
+        self.all_anchors.add(anchor)
+        if self._container_state == 1:
+            self.container_anchors.add(anchor)
+        if self._heading_state == 1:
+            self.heading_anchors.add(anchor)
+
+    def handle_starttag(self, tag, attrs):
+        self.scan_starttag(tag, dict(attrs))
+
+    def handle_endtag(self, tag):
+        self.scan_endtag(tag)
+
+    def handle_data(self, data):
+        self.scan_data(data)
+
 
-    return anchors
+def extract_toc_anchors(html_text: str) -> TOCAnchors:
+    """Extract anchor IDs from table of contents links.
 
+    This is the most reliable way to find chapter boundaries per the extraction guide.
+    TOC links like <a href="#chapter-1"> tell us exactly where sections are.
 
-def is_section_id(element_id: str, toc_anchors: List[str] = None) -> Tuple[bool, str]:
+    A toc container wins over a "Contents" heading wherever it is, so a regex
+    pre-check finds the first tag that could open either, and only the text
+    from there to the end of that block is tokenized. The whole text is
+    tokenized only when there is no such block (all internal links count).
+    """
+    hint = TOC_CONTAINER_HINT_RE.search(html_text)
+    container = hint is not None
+    if not hint:
+        hint = TOC_HEADING_HINT_RE.search(html_text)
+    # A hint inside a comment is no tag: tokenize from the start instead
+    if hint and html_text.rfind('<!--', 0, hint.start()) <= html_text.rfind('-->', 0, hint.start()):
+        locator = TOCLocator()
+        if locator.feed_block(html_text, hint.start(), container):
+            return locator.anchors
+
+    locator = TOCLocator()
+    locator.feed(html_text)
+    locator.close()
+    return locator.anchors
+
+
+def is_section_id(element_id: str, toc_anchors: Any = None) -> Tuple[bool, str]:
     """Check if an element ID marks a section boundary.
 
     Args:
         element_id: The ID attribute of an element
-        toc_anchors: List of anchor IDs from the TOC (if available)
+        toc_anchors: Anchor IDs from the TOC, a list or TOCAnchors (if available)
 
     Returns (is_section, section_type) tuple.
     """
     id_lower = element_id.lower()
 
     # Skip Gutenberg boilerplate IDs
-    if any(skip in id_lower for skip in ['gutenberg', 'license', 'pg-', 'boilerplate']):
+    if SECTION_ID_SKIP_RE.search(id_lower):
         return False, ''
 
     # If this ID is in the TOC anchors, it's definitely a section
     if toc_anchors and element_id in toc_anchors:
-        # Determine type from ID
-        if any(kw in id_lower for kw in ['preface', 'introduction', 'foreword', 'prologue', 'dedication']):
-            return True, 'front_matter'
-        if any(kw in id_lower for kw in ['epilogue', 'afterword', 'appendix', 'notes', 'index', 'glossary']):
-            return True, 'back_matter'
-        if 'content' in id_lower or 'toc' in id_lower:
-            return True, 'toc'
-        return True, 'chapter'
-
-    # Check ID patterns that indicate chapters
-    chapter_id_patterns = [
-        r'^chapter[-_]?[ivxlcdm\d]+',
-        r'^chap[-_]?[ivxlcdm\d]+',
-        r'^ch[-_]?[ivxlcdm\d]+',
-        r'^letter[-_]?[ivxlcdm\d]+',
-        r'^book[-_]?[ivxlcdm\d]+',
-        r'^part[-_]?[ivxlcdm\d]+',
-        r'^volume[-_]?[ivxlcdm\d]+',
-        r'^[ivxlcdm]+$',  # Pure roman numerals
-        r'^\d+$',  # Pure numbers
-    ]
+        return True, toc_anchor_type(element_id)
+
+    section_type = classify(SECTION_ID_CLASSIFIER, id_lower)
+    return bool(section_type), section_type
+
+
+# =============================================================================
+# HTTP Cache
+# =============================================================================
+
+class HTTPCache:
+    """Persistent on-disk cache of HTTP response bodies keyed by URL.
+
+    Each entry is a single file holding a JSON header line (URL, ETag,
+    Last-Modified, store time) followed by the raw body. Entries younger than
+    the TTL are served without touching the network; older ones are
+    revalidated with If-None-Match / If-Modified-Since. A revalidation (304)
+    writes the new validators and store time to a small .meta sidecar rather
+    than rewriting the body. Reads bump the file mtime, which drives
+    size-bounded LRU eviction.
+
+    Several extraction processes can share one cache directory: entries are
+    written to a temp file and renamed into place atomically, and every
+    reader/evictor tolerates files vanishing underneath it.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024,
+                 ttl: float = DEFAULT_CACHE_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes = None  # computed lazily on first store
+
+    def _entry_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}.entry"
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Return the cached entry header for a URL, or None."""
+        path = self._entry_path(url)
+        try:
+            with open(path, 'rb') as f:
+                entry = json.loads(f.readline().decode('utf-8'))
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != url:
+            return None
+        # A sidecar left by refresh() applies only to the body it revalidated
+        entry['body_stored_at'] = entry.get('stored_at')
+        try:
+            with open(path.with_suffix('.meta'), 'rb') as f:
+                meta = json.load(f)
+            if meta.get('body_stored_at') == entry['body_stored_at']:
+                entry.update(meta)
+        except (OSError, ValueError):
+            pass
+        entry['path'] = str(path)
+        return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """Check whether an entry can be served without revalidation."""
+        return time.time() - entry.get('stored_at', 0) < self.ttl
+
+    def conditional_headers(self, entry: Dict) -> Dict[str, str]:
+        """Build revalidation headers for a stale entry."""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def read_body(self, entry: Dict) -> Optional[bytes]:
+        """Read a cached body and mark the entry as recently used."""
+        f = self.open_body(entry)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def open_body(self, entry: Dict):
+        """Open a cached body for incremental reading (None if it vanished).
+
+        Marks the entry as recently used. The caller closes the file.
+        """
+        try:
+            f = open(entry['path'], 'rb')
+            f.readline()
+            os.utime(entry['path'])
+        except OSError:
+            return None
+        return f
+
+    def store(self, url: str, body: bytes, headers: Any = None) -> None:
+        """Atomically store a response body with its validators."""
+        self._write_entry(url, self._new_entry(url, headers), [body])
+
+    def store_stream(self, url: str, chunks, headers: Any = None):
+        """Pass body chunks through while storing them.
+
+        A generator wrapping chunks; the entry is committed atomically only
+        once the stream has been read to the end, so an interrupted download
+        never leaves a truncated body in the cache.
+        """
+        path = self._entry_path(url)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            f = os.fdopen(fd, 'wb')
+            f.write(json.dumps(self._new_entry(url, headers)).encode('utf-8') + b'\n')
+        except OSError as e:
+            print(f"  Warning: Could not write cache entry: {e}")
+            yield from chunks
+            return
+
+        size = 0
+        completed = False
+        try:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+                yield chunk
+            completed = True
+        finally:
+            f.close()
+            try:
+                if completed:
+                    os.replace(tmp_path, path)
+                else:
+                    os.unlink(tmp_path)
+            except OSError:
+                completed = False
+        if completed:
+            self._account(size)
+
+    def refresh(self, entry: Dict, headers: Any = None) -> None:
+        """Record a successful revalidation (304) in the entry's .meta sidecar.
+
+        Only the validators and store time change, so the body is left alone.
+        """
+        fresh = self._new_entry(entry['url'], headers)
+        del fresh['url']
+        fresh['etag'] = fresh['etag'] or entry.get('etag')
+        fresh['last_modified'] = fresh['last_modified'] or entry.get('last_modified')
+        fresh['body_stored_at'] = entry.get('body_stored_at')
+        path = Path(entry['path']).with_suffix('.meta')
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(json.dumps(fresh).encode('utf-8'))
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            print(f"  Warning: Could not write cache entry: {e}")
+
+    def count(self, outcome: str) -> None:
+        """Count a 'hits', 'revalidated' or 'misses' outcome (from any thread)."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def _new_entry(self, url: str, headers: Any) -> Dict:
+        headers = headers or {}
+        return {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'stored_at': time.time(),
+        }
+
+    def _write_entry(self, url: str, entry: Dict, chunks) -> None:
+        path = self._entry_path(url)
+        size = 0
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(json.dumps(entry).encode('utf-8') + b'\n')
+                    for chunk in chunks:
+                        f.write(chunk)
+                        size += len(chunk)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            print(f"  Warning: Could not write cache entry: {e}")
+            return
+
+        self._account(size)
+
+    def _account(self, size: int) -> None:
+        """Add a new entry's size to the running total, evicting if needed."""
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += size
+            over_limit = self._total_bytes > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self.cache_dir.glob('*/*.entry'):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def evict(self) -> None:
+        """Delete least-recently-used entries until the cache fits max_bytes."""
+        entries = []
+        for path in self.cache_dir.glob('*/*.entry'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9  # leave headroom so we don't evict on every store
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            try:
+                path.with_suffix('.meta').unlink()
+            except OSError:
+                pass
+
+        with self._lock:
+            self._total_bytes = total
+
+    def summary(self) -> str:
+        return f"{self.hits} hits, {self.revalidated} revalidated, {self.misses} misses"
+
+
+# Shared cache used by make_request(); configured by main() (None disables caching)
+HTTP_CACHE: Optional[HTTPCache] = None
+
+
+def configure_http_cache(cache_dir: Optional[str], max_mb: float = DEFAULT_CACHE_MAX_MB,
+                         ttl: float = DEFAULT_CACHE_TTL) -> Optional[HTTPCache]:
+    """Install the shared HTTP cache (pass cache_dir=None to disable it)."""
+    global HTTP_CACHE
+    HTTP_CACHE = HTTPCache(Path(cache_dir), int(max_mb * 1024 * 1024), ttl) if cache_dir else None
+    return HTTP_CACHE
+
+
+# =============================================================================
+# HTTP Client
+# =============================================================================
+
+def iter_response_body(response: http.client.HTTPResponse, chunk_size: int = CHUNK_SIZE):
+    """Yield a response body chunk by chunk, decoding gzip/deflate on the fly.
+
+    Each compressed chunk is decompressed as soon as it is read, so the
+    compressed and decompressed forms of a body never sit in memory together.
+    """
+    encoding = (response.headers.get('Content-Encoding') or '').strip().lower()
+
+    def read():
+        chunk = response.read(chunk_size)
+        # read(amt) treats a connection closed before Content-Length as EOF
+        if not chunk and response.length:
+            raise http.client.IncompleteRead(b'', response.length)
+        return chunk
+
+    if encoding in ('', 'identity'):
+        while True:
+            chunk = read()
+            if not chunk:
+                return
+            yield chunk
+
+    if encoding in ('gzip', 'x-gzip'):
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif encoding == 'deflate':
+        decoder = None  # zlib-wrapped per RFC, but some servers send raw deflate
+    else:
+        raise http.client.HTTPException(f"Unsupported Content-Encoding: {encoding}")
+
+    try:
+        while True:
+            chunk = read()
+            if not chunk:
+                break
+            if decoder is None:
+                is_zlib = len(chunk) >= 2 and (chunk[0] & 0x0f) == 8 and ((chunk[0] << 8) | chunk[1]) % 31 == 0
+                decoder = zlib.decompressobj(zlib.MAX_WBITS if is_zlib else -zlib.MAX_WBITS)
+            data = decoder.decompress(chunk)
+            if data:
+                yield data
+        if decoder is not None:
+            data = decoder.flush()
+            if data:
+                yield data
+    except zlib.error as e:
+        raise http.client.HTTPException(f"Corrupt {encoding} response: {e}")
+
+
+class HostUnavailable(OSError):
+    """Raised instead of sending a request while a host's circuit breaker is open."""
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter: a random delay in [d/2, d], d = RETRY_DELAY * 2**attempt.
+
+    The jitter keeps threads that failed together from retrying in lockstep.
+    """
+    delay = min(MAX_BACKOFF, RETRY_DELAY * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait according to a Retry-After header (delay-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def is_throttle(status: Optional[int], retry_after: Optional[float]) -> bool:
+    """True if a response asks the client to slow down (429, or 503 with Retry-After)."""
+    return status == 429 or (status == 503 and retry_after is not None)
+
+
+class HostScheduler:
+    """Per-host politeness for HTTPClient: every request first takes a slot from its host.
+
+    - A token bucket (``rate`` requests per second, ``burst`` deep) spaces
+      requests out.
+    - A concurrency limit caps the requests waiting for their response
+      headers. A slot is given back as soon as the headers are in: a body
+      may be read slowly or left unread while its reader waits on another
+      request (a streamed HTML waiting for its RDF), and holding slots for
+      bodies could deadlock the threads. The limit adapts AIMD-style, as in TCP congestion control: each healthy, prompt
+      response raises it by 1/limit (about +1 per round of requests), while
+      a throttle (429, or 503 with Retry-After), a server error, a dropped
+      connection or a response SLOW_RESPONSE_FACTOR times slower than the
+      host's best halves it.
+    - A throttled host is paused for every thread at once, for its
+      Retry-After or else an exponential backoff with jitter.
+    - CIRCUIT_FAILURES consecutive failures open the host's circuit: requests
+      fail fast with HostUnavailable for a cooldown (doubling while the
+      host stays down), then a single probe is let through, and its success
+      closes the circuit again.
+    """
+
+    def __init__(self, rate: float = HOST_RATE, burst: int = HOST_BURST,
+                 max_concurrency: int = HOST_MAX_CONCURRENCY):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self._hosts: Dict[str, Dict] = {}
+        self._cond = threading.Condition()
+        self.throttled = 0
+        self.circuit_trips = 0
+        self.waited = 0.0
+
+    def _host(self, host: str) -> Dict:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = {
+                'tokens': float(self.burst),
+                'refilled': time.monotonic(),
+                'limit': float(min(HOST_INITIAL_CONCURRENCY, self.max_concurrency)),
+                'in_flight': 0,
+                'paused_until': 0.0,
+                'throttles': 0,
+                'best_latency': None,
+                'failures': 0,
+                'open_until': 0.0,
+                'cooldown': CIRCUIT_COOLDOWN,
+                'probing': False,
+            }
+        return state
+
+    def acquire(self, host: str) -> bool:
+        """Wait until a request may be sent to host.
+
+        Returns True if the request is the probe of an open circuit. Raises
+        HostUnavailable while the host's circuit is open.
+        """
+        started = time.monotonic()
+        with self._cond:
+            state = self._host(host)
+            probe = False
+            while True:
+                now = time.monotonic()
+                if state['open_until'] and not probe:
+                    if now < state['open_until'] or state['probing']:
+                        raise HostUnavailable(f"{host} is unavailable after {state['failures']} "
+                                              f"failures; retrying in {max(0, state['open_until'] - now):.0f}s")
+                    state['probing'] = probe = True
+
+                if self.rate > 0:
+                    state['tokens'] = min(self.burst, state['tokens'] + (now - state['refilled']) * self.rate)
+                    state['refilled'] = now
+                if now < state['paused_until']:
+                    wait = state['paused_until'] - now
+                elif state['in_flight'] >= int(state['limit']):
+                    wait = None  # until a request finishes
+                elif self.rate > 0 and state['tokens'] < 1:
+                    wait = (1 - state['tokens']) / self.rate
+                else:
+                    break
+                self._cond.wait(wait)
+
+            if self.rate > 0:
+                state['tokens'] -= 1
+            state['in_flight'] += 1
+            self.waited += time.monotonic() - started
+        return probe
+
+    def record(self, host: str, status: Optional[int], latency: float = None,
+               retry_after: Optional[float] = None) -> None:
+        """Adjust a host's limits after a response (status None: the connection failed)."""
+        with self._cond:
+            state = self._host(host)
+            now = time.monotonic()
+            throttled = is_throttle(status, retry_after)
+            failed = status is None or (status >= 500 and not throttled)
+
+            if failed:
+                state['failures'] += 1
+                if state['probing'] or state['failures'] >= CIRCUIT_FAILURES:
+                    if state['probing']:
+                        state['cooldown'] = min(state['cooldown'] * 2, MAX_CIRCUIT_COOLDOWN)
+                    elif not state['open_until']:
+                        self.circuit_trips += 1
+                        print(f"  Warning: {host} failed {state['failures']} times in a row, "
+                              f"pausing requests for {state['cooldown']}s")
+                    state['open_until'] = now + state['cooldown']
+                    state['probing'] = False
+            else:
+                state['failures'] = 0
+                state['open_until'] = 0.0
+                state['cooldown'] = CIRCUIT_COOLDOWN
+                state['probing'] = False
+
+            slow = False
+            if throttled:
+                self.throttled += 1
+                state['throttles'] += 1
+                delay = retry_after if retry_after is not None else backoff_delay(state['throttles'] - 1)
+                state['paused_until'] = max(state['paused_until'], now + min(delay, MAX_RETRY_AFTER))
+            elif not failed:
+                state['throttles'] = 0
+                if latency is not None:
+                    best = state['best_latency']
+                    slow = best is not None and latency > SLOW_RESPONSE_FACTOR * max(best, 0.05)
+                    state['best_latency'] = latency if best is None else min(best, latency)
+
+            if throttled or failed or slow:
+                state['limit'] = max(1.0, state['limit'] / 2)
+            else:
+                state['limit'] = min(float(self.max_concurrency), state['limit'] + 1 / state['limit'])
+            self._cond.notify_all()
+
+    def release(self, host: str, unanswered_probe: bool = False) -> None:
+        """Give back a slot once a request's response headers are in.
+
+        unanswered_probe: the request was the circuit's probe and ended
+        without a response to record(), so the next request probes instead.
+        """
+        with self._cond:
+            state = self._host(host)
+            state['in_flight'] -= 1
+            if unanswered_probe:
+                state['probing'] = False
+            self._cond.notify_all()
+
+    def summary(self) -> str:
+        with self._cond:
+            limits = ', '.join(f"{host} {state['limit']:.0f}" for host, state in sorted(self._hosts.items()))
+        summary = f"{self.waited:.1f}s queued (all threads), concurrency {limits or 'n/a'}"
+        if self.throttled:
+            summary += f", {self.throttled} throttled"
+        if self.circuit_trips:
+            summary += f", circuit opened {self.circuit_trips} times"
+        return summary
+
+
+class HTTPClient:
+    """Thread-safe keep-alive HTTP client with a per-host connection pool.
+
+    Every fetch for a book goes to the same couple of hosts (gutenberg.org,
+    gutendex.com), so reusing connections saves a TCP + TLS handshake per
+    request. Idle connections are parked per (scheme, host, port) and handed
+    to one thread at a time; a pooled connection the server has already
+    closed is transparently replaced by a fresh one. Requests are paced per
+    host by a HostScheduler.
+    """
+
+    def __init__(self, max_idle: int = MAX_IDLE_CONNECTIONS, rate: float = HOST_RATE):
+        self.max_idle = max_idle
+        self.scheduler = HostScheduler(rate)
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+        self.connections_opened = 0
+        self.requests_sent = 0
+        self.resumed = 0
+
+    def _acquire(self, key: Tuple[str, str, int], timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """Get an idle connection for a host, or open a new one.
+
+        Returns (connection, reused) tuple.
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+
+        scheme, host, port = key
+        if scheme == 'https':
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        with self._lock:
+            self.connections_opened += 1
+        return conn, False
+
+    def _release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, url: str, headers: Dict[str, str] = None,
+                timeout: float = 30) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """GET a URL, following redirects.
+
+        Returns (status, headers, body) tuple. Raises OSError or
+        http.client.HTTPException on network failure.
+        """
+        status, response_headers, chunks = self.stream(url, headers, timeout)
+        return status, response_headers, b''.join(chunks)
+
+    def stream(self, url: str, headers: Dict[str, str] = None, timeout: float = 30):
+        """GET a URL, following redirects, without reading the body.
+
+        Returns (status, headers, chunks) tuple, where chunks is a generator
+        of decoded body chunks. The connection returns to the pool once the
+        generator is exhausted (it is closed if the generator is abandoned).
+        Raises OSError or http.client.HTTPException on network failure, and
+        HostUnavailable while the host's circuit breaker is open.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            parsed = urlparse(url)
+            scheme = parsed.scheme.lower()
+            if scheme not in ('http', 'https'):
+                raise ValueError(f"Unsupported URL scheme: {url}")
+            port = parsed.port or (443 if scheme == 'https' else 80)
+            key = (scheme, parsed.hostname, port)
+            path = parsed.path or '/'
+            if parsed.query:
+                path += '?' + parsed.query
+
+            probe = self.scheduler.acquire(key[1])
+            started = time.monotonic()
+            try:
+                response, conn = self._send(key, path, headers or {}, timeout)
+            except (OSError, http.client.HTTPException):
+                self.scheduler.record(key[1], None)
+                self.scheduler.release(key[1])
+                raise
+            except BaseException:
+                self.scheduler.release(key[1], unanswered_probe=probe)
+                raise
+            self.scheduler.record(key[1], response.status, time.monotonic() - started,
+                                  parse_retry_after(response.headers.get('Retry-After')))
+            self.scheduler.release(key[1])  # the body is read outside the limit
+            body = self._iter_and_release(key, conn, response)
+            next(body)  # start it, so its cleanup runs even if the body is never read
+
+            location = response.headers.get('Location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                # Drain the redirect body so the connection can be reused
+                for _ in body:
+                    pass
+                url = urljoin(url, location)
+                continue
+            return response.status, response.headers, body
+
+        raise http.client.HTTPException(f"Too many redirects for {url}")
+
+    def stream_resumable(self, url: str, headers: Dict[str, str] = None, timeout: float = 30):
+        """GET a URL like stream(), but continue a body whose connection drops.
+
+        After a mid-body failure the rest of the body is requested with
+        ``Range: bytes=<received>-``, guarded by If-Range so that a file
+        changed on the server in the meantime is never spliced onto the old
+        bytes. Up to MAX_RESUMES resumes per body; each costs only the
+        missing bytes. Responses without a validator (strong ETag or
+        Last-Modified) or with a Content-Encoding cannot be resumed, and fail
+        mid-body as with stream().
+        """
+        status, response_headers, chunks = self.stream(url, headers, timeout)
+        if status != 200:
+            return status, response_headers, chunks
+        return status, response_headers, self._resume(url, headers or {}, timeout,
+                                                      response_headers, chunks)
+
+    def _resume(self, url, headers, timeout, first_headers, chunks):
+        etag = first_headers.get('ETag')
+        validator = etag if etag and not etag.startswith('W/') else first_headers.get('Last-Modified')
+        encoding = (first_headers.get('Content-Encoding') or '').strip().lower()
+        resumable = validator and encoding in ('', 'identity')
+        received = 0
+        resumes = 0
+        while True:
+            try:
+                for chunk in chunks:
+                    received += len(chunk)
+                    yield chunk
+                return
+            except (OSError, http.client.HTTPException) as e:
+                error = e
+
+            while True:
+                if not resumable or resumes >= MAX_RESUMES:
+                    raise error
+                if resumes:
+                    time.sleep(backoff_delay(resumes - 1))
+                resumes += 1
+                range_headers = dict(headers, **{'Range': f'bytes={received}-', 'If-Range': validator})
+                try:
+                    status, response_headers, chunks = self.stream(url, range_headers, timeout)
+                except HostUnavailable:
+                    raise
+                except (OSError, http.client.HTTPException) as e:
+                    error = e
+                    continue
+                content_range = response_headers.get('Content-Range') or ''
+                encoding = (response_headers.get('Content-Encoding') or '').strip().lower()
+                if (status == 206 and content_range.startswith(f'bytes {received}-')
+                        and encoding in ('', 'identity')):
+                    break
+                # 200 means the file changed (or Range is unsupported): the
+                # bytes already passed on cannot be taken back
+                chunks.close()
+                raise http.client.HTTPException(
+                    f"Could not resume {url} at byte {received} (HTTP {status})")
+
+            with self._lock:
+                self.resumed += 1
+
+    def _iter_and_release(self, key, conn, response):
+        # Returns the connection to the pool once the body is done
+        completed = False
+        try:
+            yield  # primed by stream()
+            yield from iter_response_body(response)
+            completed = True
+        except (OSError, http.client.HTTPException):
+            self.scheduler.record(key[1], None)
+            raise
+        finally:
+            if completed and not response.will_close:
+                self._release(key, conn)
+            else:
+                conn.close()
+
+    def _send(self, key, path, headers, timeout):
+        # A reused connection may have been closed by the server while idle;
+        # that is not a real failure, so retry once on a fresh connection.
+        for _ in range(2):
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                    BrokenPipeError, ConnectionResetError):
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            with self._lock:
+                self.requests_sent += 1
+            return response, conn
+        raise http.client.HTTPException(f"Connection to {key[1]} dropped")
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def summary(self) -> str:
+        summary = f"{self.requests_sent} requests over {self.connections_opened} connections"
+        if self.resumed:
+            summary += f", {self.resumed} interrupted downloads resumed"
+        return f"{summary}; {self.scheduler.summary()}"
+
+
+# Shared client used by make_request() for all metadata, HTML and image fetches
+HTTP_CLIENT = HTTPClient()
+
+
+def configure_http_client(rate: float = HOST_RATE) -> HTTPClient:
+    """Install a fresh shared HTTP client limited to rate requests per second per host."""
+    global HTTP_CLIENT
+    HTTP_CLIENT.close()
+    HTTP_CLIENT = HTTPClient(rate=rate)
+    return HTTP_CLIENT
+
+
+# =============================================================================
+# Image Store
+# =============================================================================
+
+def link_or_copy(source: Path, target: Path) -> None:
+    """Atomically make target a hardlink to source (a copy across devices)."""
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix='.tmp')
+    os.close(fd)
+    os.unlink(tmp_path)
+    try:
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+class BlobStore:
+    """Content-addressed store for downloaded images, shared across books and runs.
+
+    Each distinct image is kept once, as <root>/<sha256[:2]>/<sha256>; the
+    per-book images/ files are hardlinks to the blobs (copies where links
+    are not possible). index.sqlite maps image URLs to hashes, so an image
+    URL seen before - the same decorations, logos and plates recur across
+    many books - is not downloaded again while the mapping is younger than
+    the HTTP cache TTL; after that the URL is fetched again through the
+    HTTP cache, which revalidates it. Blobs are never modified in
+    place (outputs are replaced atomically), so sharing them is safe; the
+    whole directory can be deleted at any time.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.hits = 0
+        self.stored = 0
+        self.linked = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _index(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.root / 'index.sqlite', timeout=30,
+                                         check_same_thread=False, isolation_level=None)
+            self._conn.execute('CREATE TABLE IF NOT EXISTS urls '
+                               '(url TEXT PRIMARY KEY, sha256 TEXT NOT NULL, stored_at REAL)')
+        return self._conn
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def lookup(self, url: str) -> Optional[str]:
+        """Hash of a URL's content if it is in the store and was indexed within the HTTP cache TTL."""
+        with self._lock:
+            row = self._index().execute('SELECT sha256, stored_at FROM urls WHERE url = ?', (url,)).fetchone()
+        if not row or not self.blob_path(row[0]).exists():
+            return None
+        ttl = HTTP_CACHE.ttl if HTTP_CACHE else DEFAULT_CACHE_TTL
+        if time.time() - (row[1] or 0) >= ttl:
+            return None
+        return row[0]
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Hash of a URL's content, downloading it into the store if it is not there yet.
+
+        The download streams straight into a temp file under the store root
+        (see download_to_file()) that is renamed to its blob path, so the
+        image is never held in memory. A URL whose index entry has expired
+        is downloaded again: open_stream() revalidates it with the HTTP
+        cache's ETag/Last-Modified, so an unchanged image is re-read from
+        the cache after a 304 and a changed one gets its new hash. Returns
+        None if the URL is unavailable.
+        """
+        digest = self.lookup(url)
+        if digest:
+            with self._lock:
+                self.hits += 1
+            return digest
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        downloaded = download_to_file(url, self.root)
+        if downloaded is None:
+            return None
+        digest = self._commit(*downloaded[:2])
+
+        # Local files may change under the same URL, so only index remote ones
+        if not url.startswith('file://'):
+            with self._lock:
+                self._index().execute('INSERT OR REPLACE INTO urls VALUES (?, ?, ?)',
+                                      (url, digest, time.time()))
+        return digest
+
+    def add(self, chunks) -> Optional[str]:
+        """Store a body given as bytes chunks (e.g. a zip member); return its hash, or None if empty."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path, digest, size = spool_to_file(chunks, self.root)
+        if not size:
+            os.unlink(tmp_path)
+            return None
+        return self._commit(tmp_path, digest)
+
+    def _commit(self, tmp_path: Path, digest: str) -> str:
+        # Move a spooled temp file to its blob path (or drop it if the blob exists)
+        path = self.blob_path(digest)
+        try:
+            if path.exists():
+                os.unlink(tmp_path)
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                publish_mode(tmp_path, path)  # book images are hardlinks to the blob
+                os.replace(tmp_path, path)
+                with self._lock:
+                    self.stored += 1
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+        return digest
+
+    def size(self, digest: str) -> int:
+        return self.blob_path(digest).stat().st_size
+
+    def link(self, digest: str, target: Path) -> bool:
+        """Make target a hardlink to a blob (a copy across devices).
+
+        A target already holding the blob or its bytes is left alone, so it
+        keeps its mtime. Returns True if target was (re)placed.
+        """
+        blob = self.blob_path(digest)
+        try:
+            if os.path.samefile(blob, target) or file_digest(target) == digest:
+                return False
+        except OSError:
+            pass
+        link_or_copy(blob, target)
+        with self._lock:
+            self.linked += 1
+        return True
+
+    def summary(self) -> str:
+        return f"{self.hits} known URLs, {self.stored} new images stored, {self.linked} linked"
+
+
+class SpooledDownloads:
+    """Stand-in for BlobStore when the image store is disabled (--no-image-store).
+
+    Same interface, but nothing is kept: fetch() and add() spool each body
+    to a temp file in directory (on the same filesystem as the books'
+    images/), and link() renames it into place, or copies it if it was
+    already placed under another name. discard() deletes whatever was never
+    placed, e.g. after a failed run.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._files = {}  # sha256 -> [path, placed]
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Download a URL into a temp file; return its hash, or None if it is unavailable."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        downloaded = download_to_file(url, self.directory)
+        if downloaded is None:
+            return None
+        return self._commit(*downloaded[:2])
+
+    def add(self, chunks) -> Optional[str]:
+        """Spool a body given as bytes chunks; return its hash, or None if empty."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path, digest, size = spool_to_file(chunks, self.directory)
+        if not size:
+            os.unlink(tmp_path)
+            return None
+        return self._commit(tmp_path, digest)
+
+    def _commit(self, tmp_path: Path, digest: str) -> str:
+        with self._lock:
+            if digest in self._files:
+                os.unlink(tmp_path)
+            else:
+                self._files[digest] = [Path(tmp_path), False]
+        return digest
+
+    def blob_path(self, digest: str) -> Path:
+        with self._lock:
+            return self._files[digest][0]
+
+    def size(self, digest: str) -> int:
+        return self.blob_path(digest).stat().st_size
+
+    def link(self, digest: str, target: Path) -> bool:
+        """Move the downloaded file to target (copy it if it is already placed).
+
+        A target already holding the bytes is left alone, so it keeps its
+        mtime. Returns True if target was (re)placed.
+        """
+        with self._lock:
+            entry = self._files[digest]
+            path, placed = entry
+            try:
+                unchanged = file_digest(target) == digest
+            except OSError:
+                unchanged = False
+            if unchanged:
+                if not placed:
+                    os.unlink(path)
+                entry[:] = [target, True]
+                return False
+            if placed:
+                link_or_copy(path, target)
+            else:
+                publish_mode(path, target)
+                os.replace(path, target)
+                entry[:] = [target, True]
+        return True
+
+    def discard(self) -> None:
+        """Delete the temp files that were never placed."""
+        with self._lock:
+            for path, placed in self._files.values():
+                if not placed:
+                    with contextlib.suppress(OSError):
+                        os.unlink(path)
+            self._files.clear()
+
+
+# Shared store used by fetch_cover() and ImageExtractor; configured by main() (None disables it)
+IMAGE_STORE: Optional[BlobStore] = None
+
+
+def configure_image_store(root: Optional[str]) -> Optional[BlobStore]:
+    """Install the shared image store (pass root=None to disable it)."""
+    global IMAGE_STORE
+    IMAGE_STORE = BlobStore(Path(root)) if root else None
+    return IMAGE_STORE
+
+
+def image_store_for(output_base: Path) -> BlobStore | SpooledDownloads:
+    """IMAGE_STORE, or SpooledDownloads into output_base when the shared store is disabled.
+
+    A streamed download needs somewhere to land before the image's name in
+    the book is known; without a store that is a temp file next to the
+    books. Call discard() on a SpooledDownloads when the book is done.
+    """
+    return IMAGE_STORE or SpooledDownloads(Path(output_base))
+
+
+# =============================================================================
+# Local Mirror
+# =============================================================================
+
+class GutenbergMirror:
+    """A local (rsync) mirror of gutenberg.org that answers its URLs from disk.
+
+    A gutenberg.org URL maps to the same path under the mirror root, so the
+    GUTENBERG_URLS patterns, covers and the inline images of a book (relative
+    to its HTML) all resolve without per-URL configuration. The usual mirror
+    layouts are covered as well: RDF under cache/epub/<id>/pg<id>.rdf, and
+    files/<id>/ kept in the digit tree of the main rsync module
+    (1/3/4/1342/ for book 1342).
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root).absolute()
+
+    def serves(self, url: str) -> bool:
+        return url.startswith(('http://', 'https://')) and urlparse(url).hostname in MIRROR_HOSTS
+
+    def resolve(self, url: str) -> Optional[Path]:
+        """The mirror file for a gutenberg.org URL, or None if the mirror lacks it."""
+        path = unquote(urlparse(url).path).lstrip('/')
+        if '..' in path.split('/'):
+            return None
+        for candidate in self._candidates(path):
+            file_path = self.root / candidate
+            if file_path.is_file():
+                return file_path
+        return None
+
+    def _candidates(self, path: str):
+        yield path
+        rdf_match = re.fullmatch(r'ebooks/(\d+)\.rdf', path)
+        if rdf_match:
+            book_id = rdf_match.group(1)
+            yield f"cache/epub/{book_id}/pg{book_id}.rdf"
+        files_match = re.fullmatch(r'files/(\d+)/(.+)', path)
+        if files_match:
+            yield f"{mirror_tree_path(files_match.group(1))}/{files_match.group(2)}"
+
+    def book_ids(self) -> List[str]:
+        """IDs of all books with HTML in the mirror."""
+        ids = {path.parent.name for path in (self.root / 'cache' / 'epub').glob('*/pg*-images.html')}
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for name in filenames:
+                id_match = re.fullmatch(r'(\d+)-h\.html?', name)
+                if id_match:
+                    ids.add(id_match.group(1))
+        return sorted((book_id for book_id in ids if book_id.isdigit()), key=int)
+
+
+def mirror_tree_path(book_id: str) -> str:
+    """Directory of a book in the main mirror's digit tree: every digit but the last, then the ID."""
+    return '/'.join(list(book_id[:-1]) + [book_id]) if len(book_id) > 1 else f"0/{book_id}"
 
-    for pattern in chapter_id_patterns:
-        if re.match(pattern, id_lower):
-            return True, 'chapter'
 
-    # Check for front/back matter IDs
-    if any(kw in id_lower for kw in ['preface', 'introduction', 'foreword', 'prologue', 'dedication']):
-        return True, 'front_matter'
-    if any(kw in id_lower for kw in ['epilogue', 'afterword', 'appendix', 'index', 'glossary', 'bibliography']):
-        return True, 'back_matter'
-    if 'content' in id_lower or 'toc' in id_lower:
-        return True, 'toc'
+# Mirror used by make_request() and open_stream(); configured by main() (None: use the network)
+MIRROR: Optional[GutenbergMirror] = None
 
-    return False, ''
+
+def configure_mirror(root: Optional[str]) -> Optional[GutenbergMirror]:
+    """Serve gutenberg.org URLs from a local mirror (pass root=None for the network)."""
+    global MIRROR
+    MIRROR = GutenbergMirror(Path(root)) if root else None
+    return MIRROR
 
 
 # =============================================================================
@@ -318,67 +1676,222 @@ def is_section_id(element_id: str, toc_anchors: List[str] = None) -> Tuple[bool,
 # =============================================================================
 
 def make_request(url: str, binary: bool = False, timeout: int = 30) -> Optional[bytes | str]:
-    """Make an HTTP request with retries and error handling."""
-    import subprocess
-    import shutil
+    """Make an HTTP request with retries and error handling.
+
+    Requests go through the pooled HTTP_CLIENT. HTTP(S) responses also go
+    through HTTP_CACHE when it is configured: fresh entries are returned
+    without a request, stale ones are revalidated. With a MIRROR, its
+    gutenberg.org URLs are read from disk instead.
+    """
+    def decode(content: bytes) -> bytes | str:
+        if binary:
+            return content
+        return content.decode('utf-8', errors='replace')
+
+    if MIRROR and MIRROR.serves(url):
+        path = MIRROR.resolve(url)
+        if path is None:
+            return None
+        url = path.as_uri()
+
+    # Local files (e.g. images next to a --local-html book)
+    if url.startswith('file://'):
+        try:
+            with open(url2pathname(urlparse(url).path), 'rb') as f:
+                return decode(f.read())
+        except OSError:
+            return None
+
+    cache = HTTP_CACHE
+    entry = cache.lookup(url) if cache else None
+    if entry and cache.is_fresh(entry):
+        cached = cache.read_body(entry)
+        if cached is not None:
+            cache.count('hits')
+            return decode(cached)
+        entry = None
+
+    headers = dict(HEADERS)
+    if entry:
+        headers.update(cache.conditional_headers(entry))
 
-    # First try with urllib
     for attempt in range(MAX_RETRIES):
         try:
-            request = Request(url, headers=HEADERS)
-            with urlopen(request, timeout=timeout) as response:
-                content = response.read()
-                if binary:
-                    return content
-                return content.decode('utf-8', errors='replace')
-        except HTTPError as e:
-            if e.code == 404:
-                # Try wget/curl as fallback before giving up on 404
-                break
-            if attempt == MAX_RETRIES - 1:
-                break
-        except URLError as e:
-            if attempt == MAX_RETRIES - 1:
-                break
-        except Exception as e:
-            if attempt == MAX_RETRIES - 1:
+            status, response_headers, content = HTTP_CLIENT.request(url, headers, timeout)
+        except HostUnavailable:
+            break  # fail fast while the host is down
+        except (OSError, http.client.HTTPException, ValueError):
+            status = None
+        else:
+            if status == 200:
+                if cache:
+                    cache.count('misses')
+                    cache.store(url, content, response_headers)
+                return decode(content)
+            if status == 304 and entry:
+                cached = cache.read_body(entry)
+                if cached is not None:
+                    cache.count('revalidated')
+                    cache.refresh(entry, response_headers)
+                    return decode(cached)
+            if 400 <= status < 500 and status not in (408, 429):
+                # Client errors (404 etc.) will not go away on retry
                 break
 
-        time.sleep(RETRY_DELAY * (attempt + 1))
+        # A throttled host is already paused by HTTP_CLIENT's scheduler
+        if attempt < MAX_RETRIES - 1 and not (
+                status and is_throttle(status, parse_retry_after(response_headers.get('Retry-After')))):
+            time.sleep(backoff_delay(attempt))
+
+    # Network is unavailable: a stale cached copy beats nothing
+    if entry:
+        cached = cache.read_body(entry)
+        if cached is not None:
+            print(f"  Warning: Using stale cached copy of {url}")
+            return decode(cached)
+
+    return None
+
+
+def iter_file_chunks(f, chunk_size: int = CHUNK_SIZE):
+    """Yield a binary file's contents chunk by chunk, closing it at the end."""
+    with f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def open_stream(url: str, timeout: int = 30):
+    """Open a URL for incremental reading.
 
-    # Fallback: Try wget
-    if shutil.which('wget'):
+    The streaming counterpart of make_request(): same cache, retry and
+    client behavior, but returns an iterator of body bytes chunks as they
+    arrive (or None if the URL is unavailable). Retries cover opening the
+    stream; a body interrupted midway is continued with Range requests where
+    the server allows it (HTTPClient.stream_resumable), otherwise the error
+    is raised as OSError/http.client.HTTPException.
+    """
+    if MIRROR and MIRROR.serves(url):
+        path = MIRROR.resolve(url)
+        if path is None:
+            return None
+        url = path.as_uri()
+
+    # Local files (e.g. a --local-html book or a mirror file)
+    if url.startswith('file://'):
         try:
-            result = subprocess.run(
-                ['wget', '-q', '-O', '-', '--timeout=30', url],
-                capture_output=True,
-                timeout=timeout + 10
-            )
-            if result.returncode == 0 and result.stdout:
-                if binary:
-                    return result.stdout
-                return result.stdout.decode('utf-8', errors='replace')
-        except Exception:
-            pass
+            return iter_file_chunks(open(url2pathname(urlparse(url).path), 'rb'))
+        except OSError:
+            return None
+
+    cache = HTTP_CACHE
+    entry = cache.lookup(url) if cache else None
+    if entry and cache.is_fresh(entry):
+        f = cache.open_body(entry)
+        if f is not None:
+            cache.count('hits')
+            return iter_file_chunks(f)
+        entry = None
+
+    headers = dict(HEADERS)
+    if entry:
+        headers.update(cache.conditional_headers(entry))
 
-    # Fallback: Try curl
-    if shutil.which('curl'):
+    for attempt in range(MAX_RETRIES):
         try:
-            result = subprocess.run(
-                ['curl', '-s', '-L', '--max-time', str(timeout), url],
-                capture_output=True,
-                timeout=timeout + 10
-            )
-            if result.returncode == 0 and result.stdout:
-                if binary:
-                    return result.stdout
-                return result.stdout.decode('utf-8', errors='replace')
-        except Exception:
-            pass
+            status, response_headers, chunks = HTTP_CLIENT.stream_resumable(url, headers, timeout)
+        except HostUnavailable:
+            break  # fail fast while the host is down
+        except (OSError, http.client.HTTPException, ValueError):
+            status = None
+        else:
+            if status == 200:
+                if cache:
+                    cache.count('misses')
+                    return cache.store_stream(url, chunks, response_headers)
+                return chunks
+            # Drain the (small) error body so the connection is reused
+            try:
+                for _ in chunks:
+                    pass
+            except (OSError, http.client.HTTPException):
+                pass
+            if status == 304 and entry:
+                cache.refresh(entry, response_headers)
+                f = cache.open_body(entry)
+                if f is not None:
+                    cache.count('revalidated')
+                    return iter_file_chunks(f)
+            if 400 <= status < 500 and status not in (408, 429):
+                # Client errors (404 etc.) will not go away on retry
+                break
+
+        # A throttled host is already paused by HTTP_CLIENT's scheduler
+        if attempt < MAX_RETRIES - 1 and not (
+                status and is_throttle(status, parse_retry_after(response_headers.get('Retry-After')))):
+            time.sleep(backoff_delay(attempt))
+
+    # Network is unavailable: a stale cached copy beats nothing
+    if entry:
+        f = cache.open_body(entry)
+        if f is not None:
+            print(f"  Warning: Using stale cached copy of {url}")
+            return iter_file_chunks(f)
+
+    return None
+
+
+def download_to_file(url: str, directory: Path, timeout: int = 30) -> Optional[Tuple[Path, str, int]]:
+    """Download a URL into a new temp file in directory, hashing it on the way.
+
+    The body goes to disk chunk by chunk, so memory use does not depend on
+    its size, and an interrupted transfer is resumed rather than restarted
+    (see open_stream()); only if that fails is it downloaded again from the
+    start. The caller renames the file into place.
+
+    Returns (temp_path, sha256, size) tuple, or None if the URL is
+    unavailable or empty.
+    """
+    for attempt in range(MAX_RETRIES):
+        chunks = open_stream(url, timeout)
+        if chunks is None:
+            return None
+        try:
+            tmp_path, digest, size = spool_to_file(chunks, directory)
+        except (OSError, http.client.HTTPException) as e:
+            print(f"  Warning: Download of {url} failed: {e}")
+            continue
+        if not size:
+            os.unlink(tmp_path)
+            return None
+        return tmp_path, digest, size
 
     return None
 
 
+def spool_to_file(chunks, directory: Path) -> Tuple[Path, str, int]:
+    """Write bytes chunks to a new temp file in directory, hashing them on the way.
+
+    Returns (temp_path, sha256, size) tuple; the temp file is removed if
+    the chunks raise.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.download-', suffix='.tmp')
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return Path(tmp_path), digest.hexdigest(), size
+
+
 def sanitize_filename(text: str, max_length: int = 50) -> str:
     """Convert text to safe filename."""
     if not text:
@@ -444,6 +1957,93 @@ def create_slug(title: str, author: str = None, book_id: str = None) -> str:
     return '-'.join(parts) if parts else f"book-{book_id}"
 
 
+def content_digest(content: Optional[bytes | str]) -> Optional[str]:
+    """SHA-256 hex digest of a response or file body (None stays None)."""
+    if content is None:
+        return None
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 hex digest of a file, hashed from a memory map of it."""
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return hashlib.sha256().hexdigest()  # empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Mode open() would give a new file; mkstemp() temp files are 0600 until published
+NEW_FILE_MODE = 0o666 & ~_current_umask()
+
+
+def publish_mode(tmp_path: str | Path, target: Path) -> None:
+    """Give a temp file that is about to replace target the mode a plainly written file would have.
+
+    That is target's own mode if it exists, else NEW_FILE_MODE.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(target).st_mode)
+    except OSError:
+        mode = NEW_FILE_MODE
+    os.chmod(tmp_path, mode)
+
+
+def atomic_write(path: Path, content: bytes | str) -> None:
+    """Write a file via a temp file and rename, so it is never seen half-written.
+
+    The temp file is a dotfile next to the target (ignored by Jekyll) and is
+    removed if the write fails.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        publish_mode(tmp_path, path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_if_changed(path: Path, content: bytes | str, ignore: re.Pattern = None) -> bool:
+    """Write content to path unless the file already holds the same bytes.
+
+    Unchanged files keep their mtime, so incremental site builds skip them;
+    changed ones are replaced atomically.
+    Differences only in lines matching ignore (e.g. EXTRACTED_AT_RE) do not
+    count as a change. Returns True if the file was written.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            existing = f.read()
+    except OSError:
+        existing = None
+    if existing == content:
+        return False
+    if existing is not None and ignore is not None and \
+            ignore.sub(b'', existing) == ignore.sub(b'', content):
+        return False
+    atomic_write(path, content)
+    return True
+
+
 # =============================================================================
 # Metadata Extraction
 # =============================================================================
@@ -474,43 +2074,66 @@ class MetadataExtractor:
         # Dublin Core metadata
         meta_patterns = {
             'title': r'<meta\s+name="dc\.title"\s+content="([^"]+)"',
-            'author': r'<meta\s+name="dc\.creator"\s+content="([^"]+)"',
+            'creator': r'<meta\s+name="dc\.creator"\s+content="([^"]+)"',
             'language': r'<meta\s+name="dc\.language"\s+content="([^"]+)"',
             'rights': r'<meta\s+name="dc\.rights"\s+content="([^"]+)"',
             'subject': r'<meta\s+name="dc\.subject"\s+content="([^"]+)"',
         }
 
+        dc_meta = {}
         for key, pattern in meta_patterns.items():
             matches = re.findall(pattern, html_content, re.IGNORECASE)
             if matches:
-                if key == 'subject':
-                    self.metadata['subjects'].extend([html.unescape(m) for m in matches])
-                else:
-                    value = html.unescape(matches[0])
-                    if key == 'author':
-                        # Clean up author name (remove dates)
-                        value = re.sub(r'\s*\([^)]+\)\s*$', '', value)
-                        self.metadata['author'] = value
-                        if value not in self.metadata['authors']:
-                            self.metadata['authors'].append(value)
-                    else:
-                        self.metadata[key] = value
+                dc_meta[key] = [html.unescape(m) for m in matches]
+
+        title_match = re.search(r'<title>([^<]+)</title>', html_content, re.IGNORECASE)
+        page_title = html.unescape(title_match.group(1)) if title_match else None
+
+        self.apply_html_meta(dc_meta, page_title)
+
+    def apply_html_meta(self, dc_meta: Dict[str, List[str]], page_title: Optional[str] = None) -> None:
+        """Apply Dublin Core meta tag values and the <title> text.
+
+        Args:
+            dc_meta: Unescaped values per DC element ('title', 'creator', ...)
+            page_title: Unescaped text of the <title> tag, if any
+        """
+        for key in ('title', 'creator', 'language', 'rights', 'subject'):
+            values = dc_meta.get(key)
+            if not values:
+                continue
+            if key == 'subject':
+                self.metadata['subjects'].extend(values)
+            elif key == 'creator':
+                # Clean up author name (remove dates)
+                value = re.sub(r'\s*\([^)]+\)\s*$', '', values[0])
+                self.metadata['author'] = value
+                if value not in self.metadata['authors']:
+                    self.metadata['authors'].append(value)
+            else:
+                self.metadata[key] = values[0]
 
         # Fallback: Extract title from <title> tag
-        if not self.metadata['title']:
-            title_match = re.search(r'<title>([^<]+)</title>', html_content, re.IGNORECASE)
-            if title_match:
-                title = html.unescape(title_match.group(1))
-                title = re.sub(r'The Project Gutenberg eBook of\s+', '', title, flags=re.IGNORECASE)
-                title = re.sub(r',?\s*by\s+.*$', '', title, flags=re.IGNORECASE)
-                self.metadata['title'] = title.strip()
-
-    def extract_from_gutendex(self) -> None:
-        """Extract metadata from Gutendex API (rich JSON metadata)."""
+        if not self.metadata['title'] and page_title:
+            title = re.sub(r'The Project Gutenberg eBook of\s+', '', page_title, flags=re.IGNORECASE)
+            title = re.sub(r',?\s*by\s+.*$', '', title, flags=re.IGNORECASE)
+            self.metadata['title'] = title.strip()
+
+    def fetch_gutendex(self) -> Optional[str]:
+        """Fetch the raw Gutendex API response."""
         url = GUTENBERG_URLS['json_metadata'].format(id=self.book_id)
         print(f"  Fetching metadata from Gutendex API...")
+        return make_request(url)
 
-        content = make_request(url)
+    def extract_from_gutendex(self, content: Optional[str] = None, prefetched: bool = False) -> None:
+        """Extract metadata from Gutendex API (rich JSON metadata).
+
+        Args:
+            content: Response from fetch_gutendex(), if already fetched
+            prefetched: True if content was fetched elsewhere (even if None)
+        """
+        if not prefetched:
+            content = self.fetch_gutendex()
         if not content:
             print(f"  Warning: Could not fetch Gutendex metadata")
             return
@@ -556,12 +2179,21 @@ class MetadataExtractor:
         if data.get('formats'):
             self.metadata['formats'] = data['formats']
 
-    def extract_from_rdf(self) -> None:
-        """Extract metadata from RDF file (most authoritative source)."""
+    def fetch_rdf(self) -> Optional[str]:
+        """Fetch the raw RDF document."""
         url = GUTENBERG_URLS['rdf'].format(id=self.book_id)
         print(f"  Fetching RDF metadata...")
+        return make_request(url)
+
+    def extract_from_rdf(self, content: Optional[str] = None, prefetched: bool = False) -> None:
+        """Extract metadata from RDF file (most authoritative source).
 
-        content = make_request(url)
+        Args:
+            content: Response from fetch_rdf(), if already fetched
+            prefetched: True if content was fetched elsewhere (even if None)
+        """
+        if not prefetched:
+            content = self.fetch_rdf()
         if not content:
             print(f"  Warning: Could not fetch RDF metadata")
             return
@@ -600,18 +2232,256 @@ class MetadataExtractor:
         if issued_match:
             self.metadata['publication_date'] = issued_match.group(1).strip()
 
+    def extract_from_catalog(self, db_path: str) -> bool:
+        """Extract metadata from the local RDF catalog index.
+
+        Answers the same questions as extract_from_rdf() without a network
+        request. Returns False if the index has no entry for this book, so the
+        caller can fall back to the network.
+        """
+        record = lookup_catalog(db_path, self.book_id)
+        if not record:
+            return False
+        print(f"  Using local catalog index ({db_path})")
+
+        if record['title']:
+            self.metadata['title'] = record['title']
+
+        for idx, name in enumerate(record['creators']):
+            # Handle "Last, First" format
+            if ',' in name:
+                parts = name.split(',', 1)
+                name = f"{parts[1].strip()} {parts[0].strip()}"
+            if idx == 0:
+                self.metadata['author'] = name
+            if name not in self.metadata['authors']:
+                self.metadata['authors'].append(name)
+
+        if record['languages']:
+            self.metadata['language'] = record['languages'][0]
+
+        for subj in record['subjects']:
+            if subj and subj not in self.metadata['subjects']:
+                self.metadata['subjects'].append(subj)
+
+        if record['issued']:
+            self.metadata['publication_date'] = record['issued']
+
+        # Fill fields Gutendex normally supplies, if it did not
+        if not self.metadata['bookshelves'] and record['bookshelves']:
+            self.metadata['bookshelves'] = record['bookshelves']
+        if not self.metadata['rights'] and record['rights']:
+            self.metadata['rights'] = record['rights']
+        if not self.metadata['download_count'] and record['downloads']:
+            self.metadata['download_count'] = record['downloads']
+
+        return True
+
     def get_metadata(self) -> Dict[str, Any]:
         """Get all extracted metadata."""
         return self.metadata
 
 
+# =============================================================================
+# Offline RDF Catalog
+# =============================================================================
+
+RDF_NS = {
+    'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+    'dcterms': 'http://purl.org/dc/terms/',
+    'pgterms': 'http://www.gutenberg.org/2009/pgterms/',
+}
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    title TEXT,
+    issued TEXT,
+    rights TEXT,
+    downloads INTEGER
+);
+CREATE TABLE IF NOT EXISTS creators (book_id INTEGER, position INTEGER, name TEXT);
+CREATE TABLE IF NOT EXISTS languages (book_id INTEGER, position INTEGER, code TEXT);
+CREATE TABLE IF NOT EXISTS subjects (book_id INTEGER, subject TEXT);
+CREATE TABLE IF NOT EXISTS bookshelves (book_id INTEGER, shelf TEXT);
+CREATE INDEX IF NOT EXISTS idx_books_title ON books (title);
+CREATE INDEX IF NOT EXISTS idx_creators_book ON creators (book_id);
+CREATE INDEX IF NOT EXISTS idx_creators_name ON creators (name);
+CREATE INDEX IF NOT EXISTS idx_languages_book ON languages (book_id);
+CREATE INDEX IF NOT EXISTS idx_subjects_book ON subjects (book_id);
+CREATE INDEX IF NOT EXISTS idx_subjects_subject ON subjects (subject);
+CREATE INDEX IF NOT EXISTS idx_bookshelves_book ON bookshelves (book_id);
+"""
+
+
+def parse_rdf_ebook(rdf_file) -> Optional[Dict]:
+    """Stream-parse one Gutenberg RDF document into a catalog record.
+
+    Uses iterparse and clears each element once consumed, so memory use does
+    not depend on the size of the document.
+    """
+    rdf, dcterms, pgterms = (f"{{{RDF_NS[k]}}}" for k in ('rdf', 'dcterms', 'pgterms'))
+    record = None
+    path = []  # tag names of open elements
+
+    for event, elem in ET.iterparse(rdf_file, events=('start', 'end')):
+        if event == 'start':
+            path.append(elem.tag)
+            if elem.tag == pgterms + 'ebook':
+                about = elem.get(rdf + 'about', '')
+                id_match = re.search(r'(\d+)$', about)
+                if id_match:
+                    record = {'id': int(id_match.group(1)), 'title': None, 'issued': None,
+                              'rights': None, 'downloads': None, 'creators': [],
+                              'languages': [], 'subjects': [], 'bookshelves': []}
+            continue
+
+        path.pop()
+        if record is None or pgterms + 'ebook' not in path:
+            if elem.tag == pgterms + 'ebook':
+                elem.clear()
+            continue
+
+        text = (elem.text or '').strip()
+        parent = path[-1] if path else None
+        # The property element that owns this value (two levels up for rdf:value)
+        owner = path[-2] if len(path) >= 2 else None
+
+        if elem.tag == dcterms + 'title' and parent == pgterms + 'ebook' and not record['title']:
+            record['title'] = text
+        elif elem.tag == dcterms + 'issued' and parent == pgterms + 'ebook':
+            record['issued'] = text
+        elif elem.tag == dcterms + 'rights' and parent == pgterms + 'ebook':
+            record['rights'] = text
+        elif elem.tag == pgterms + 'downloads' and parent == pgterms + 'ebook' and text.isdigit():
+            record['downloads'] = int(text)
+        elif elem.tag == pgterms + 'name' and dcterms + 'creator' in path and text:
+            record['creators'].append(text)
+        elif elem.tag == rdf + 'value' and text:
+            if owner == dcterms + 'language':
+                record['languages'].append(text)
+            elif owner == dcterms + 'subject':
+                record['subjects'].append(text)
+            elif owner == pgterms + 'bookshelf':
+                record['bookshelves'].append(text)
+
+        # Free consumed subtrees of the ebook element
+        if parent == pgterms + 'ebook':
+            elem.clear()
+
+    return record
+
+
+def ingest_rdf_catalog(archive_path: str, db_path: str, batch_size: int = 1000) -> int:
+    """Build (or update) the SQLite catalog index from rdf-files.tar.bz2.
+
+    The archive is read as a stream (tarfile mode 'r|*'), one RDF member at a
+    time, so memory stays constant over the ~75,000 books in the catalog.
+    Returns the number of books indexed.
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(CATALOG_SCHEMA)
+
+    count = 0
+    started = time.perf_counter()
+    try:
+        with tarfile.open(archive_path, mode='r|*') as tar:
+            for member in tar:
+                if not member.isfile() or not member.name.endswith('.rdf'):
+                    continue
+                rdf_file = tar.extractfile(member)
+                if rdf_file is None:
+                    continue
+                try:
+                    record = parse_rdf_ebook(rdf_file)
+                except ET.ParseError as e:
+                    print(f"  Warning: Could not parse {member.name}: {e}")
+                    continue
+                if not record:
+                    continue
+
+                book_id = record['id']
+                conn.execute('INSERT OR REPLACE INTO books VALUES (?, ?, ?, ?, ?)',
+                             (book_id, record['title'], record['issued'],
+                              record['rights'], record['downloads']))
+                for table in ('creators', 'languages', 'subjects', 'bookshelves'):
+                    conn.execute(f'DELETE FROM {table} WHERE book_id = ?', (book_id,))
+                conn.executemany('INSERT INTO creators VALUES (?, ?, ?)',
+                                 [(book_id, pos, name) for pos, name in enumerate(record['creators'])])
+                conn.executemany('INSERT INTO languages VALUES (?, ?, ?)',
+                                 [(book_id, pos, code) for pos, code in enumerate(record['languages'])])
+                conn.executemany('INSERT INTO subjects VALUES (?, ?)',
+                                 [(book_id, subj) for subj in record['subjects']])
+                conn.executemany('INSERT INTO bookshelves VALUES (?, ?)',
+                                 [(book_id, shelf) for shelf in record['bookshelves']])
+
+                count += 1
+                if count % batch_size == 0:
+                    conn.commit()
+                    print(f"  Indexed {count} books ({time.perf_counter() - started:.0f}s)")
+        conn.commit()
+    finally:
+        conn.close()
+
+    return count
+
+
+def lookup_catalog(db_path: str, book_id: str) -> Optional[Dict]:
+    """Look up one book in the catalog index. Returns None if absent."""
+    if not db_path or not Path(db_path).exists() or not str(book_id).isdigit():
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{Path(db_path).absolute()}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        row = conn.execute('SELECT title, issued, rights, downloads FROM books WHERE id = ?',
+                           (int(book_id),)).fetchone()
+        if not row:
+            return None
+        book_id = int(book_id)
+        return {
+            'title': row[0],
+            'issued': row[1],
+            'rights': row[2],
+            'downloads': row[3],
+            'creators': [r[0] for r in conn.execute(
+                'SELECT name FROM creators WHERE book_id = ? ORDER BY position', (book_id,))],
+            'languages': [r[0] for r in conn.execute(
+                'SELECT code FROM languages WHERE book_id = ? ORDER BY position', (book_id,))],
+            'subjects': [r[0] for r in conn.execute(
+                'SELECT subject FROM subjects WHERE book_id = ? ORDER BY rowid', (book_id,))],
+            'bookshelves': [r[0] for r in conn.execute(
+                'SELECT shelf FROM bookshelves WHERE book_id = ? ORDER BY rowid', (book_id,))],
+        }
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+
 # =============================================================================
 # Image Extraction
 # =============================================================================
 
-def extract_image_urls(book_id: str, html_content: str, base_url: str) -> Dict:
+def find_image_refs(html_content: str) -> List[Tuple[str, str]]:
+    """Find (src, alt) pairs for every <img> tag, in document order."""
+    img_pattern = r'<img[^>]+src=["\']([^"\']+)["\'][^>]*(?:alt=["\']([^"\']*)["\'])?[^>]*>'
+    return re.findall(img_pattern, html_content, re.IGNORECASE)
+
+
+def extract_image_urls(book_id: str, html_content: str, base_url: str,
+                       image_refs: List[Tuple[str, str]] = None) -> Dict:
     """Extract image URLs without downloading them.
 
+    Args:
+        book_id: Project Gutenberg book ID
+        html_content: Book HTML (ignored when image_refs is given)
+        base_url: URL the HTML was loaded from, for resolving relative paths
+        image_refs: (src, alt) pairs already collected by a single-pass parse
+
     Returns a dict with cover URLs and inline image URLs.
     """
     result = {
@@ -623,8 +2493,7 @@ def extract_image_urls(book_id: str, html_content: str, base_url: str) -> Dict:
     }
 
     # Find all image tags in HTML
-    img_pattern = r'<img[^>]+src=["\']([^"\']+)["\'][^>]*(?:alt=["\']([^"\']*)["\'])?[^>]*>'
-    matches = re.findall(img_pattern, html_content, re.IGNORECASE)
+    matches = image_refs if image_refs is not None else find_image_refs(html_content)
 
     seen_urls = set()
     for src, alt in matches:
@@ -656,63 +2525,199 @@ def extract_image_urls(book_id: str, html_content: str, base_url: str) -> Dict:
     return result
 
 
+def fetch_cover(book_id: str, store: BlobStore) -> Optional[Tuple[str, str]]:
+    """Download the cover image into store, trying medium then small.
+
+    Returns (url, sha256) tuple, or None if no cover is available.
+    """
+    cover_urls = [
+        GUTENBERG_URLS['cover_medium'].format(id=book_id),
+        GUTENBERG_URLS['cover_small'].format(id=book_id),
+    ]
+
+    for url in cover_urls:
+        print(f"  Trying cover: {url}")
+        digest = store.fetch(url)
+        if digest:
+            return url, digest
+
+    return None
+
+
+def derivative_backend() -> Optional[str]:
+    """'pillow', the path of ImageMagick's magick/convert, or None if neither is available."""
+    if PILImage is not None:
+        return 'pillow'
+    magick = shutil.which('magick')
+    if not magick and os.name != 'nt':  # convert.exe on Windows is not ImageMagick
+        magick = shutil.which('convert')
+    return magick
+
+
+class DerivativeMaker:
+    """Create CollectionBuilder thumb and small derivatives of downloaded images.
+
+    Sources are submitted as soon as they are written and converted on a
+    thread pool (Pillow releases the GIL while resizing and encoding;
+    ImageMagick runs as a subprocess). Derivatives go to thumbs/ and small/
+    next to the source, named <source stem, lower-cased>_th.jpg / _sm.jpg
+    like the generate_derivatives rake task, plus .webp with webp=True.
+    A derivative newer than its source is left alone, and images are only
+    ever scaled down.
+    """
+
+    def __init__(self, webp: bool = False, workers: int = DEFAULT_DERIVATIVE_WORKERS):
+        self.formats = ['jpg', 'webp'] if webp else ['jpg']
+        self.backend = derivative_backend()
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers)) if self.backend else None
+        self.futures = []
+        if not self.backend:
+            print("  Warning: Neither Pillow nor ImageMagick is available, skipping image derivatives")
+
+    def submit(self, source: Path) -> None:
+        """Queue the derivatives of one image."""
+        if self.pool and source.suffix.lower() in DERIVATIVE_SOURCE_TYPES:
+            self.futures.append(self.pool.submit(self.make, source))
+
+    def targets(self, source: Path) -> List[Tuple[Path, int, Optional[int], str]]:
+        """(path, max width, max height, format) of every derivative of source."""
+        stem = source.stem.lower()
+        return [(source.parent / folder / f"{stem}{suffix}.{fmt}", width, height, fmt)
+                for folder, (suffix, width, height) in DERIVATIVES.items()
+                for fmt in self.formats]
+
+    def make(self, source: Path) -> Dict[str, List[Path]]:
+        """Create the missing or outdated derivatives of source."""
+        result = {'created': [], 'current': []}
+        source_mtime = source.stat().st_mtime
+        for target, width, height, fmt in self.targets(source):
+            if target.exists() and target.stat().st_mtime >= source_mtime:
+                result['current'].append(target)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix='.tmp')
+            os.close(fd)
+            try:
+                if self.backend == 'pillow':
+                    self._resize_pillow(source, Path(tmp_path), width, height, fmt)
+                else:
+                    self._resize_magick(source, tmp_path, width, height, fmt)
+                publish_mode(tmp_path, target)
+                os.replace(tmp_path, target)
+                result['created'].append(target)
+            except Exception as e:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+                # Usually the source itself is unreadable: one warning per image
+                print(f"  Warning: Could not create derivatives of {source.name}: {e}")
+                break
+        return result
+
+    @staticmethod
+    def _resize_pillow(source: Path, target: Path, width: int, height: Optional[int], fmt: str) -> None:
+        with PILImage.open(source) as image:
+            image.thumbnail((width, height or image.height))
+            # Flatten transparency onto white, as the rake task does
+            if image.mode in ('RGBA', 'LA', 'P'):
+                image = image.convert('RGBA')
+                flat = PILImage.new('RGB', image.size, 'white')
+                flat.paste(image, mask=image.getchannel('A'))
+                image = flat
+            elif image.mode != 'RGB':
+                image = image.convert('RGB')
+            image.save(target, format='JPEG' if fmt == 'jpg' else 'WEBP',
+                       quality=DERIVATIVE_QUALITY, optimize=True)
+
+    def _resize_magick(self, source: Path, target: str, width: int, height: Optional[int], fmt: str) -> None:
+        geometry = f"{width}x{height or ''}>"  # '>': only ever shrink
+        subprocess.run([self.backend, f"{source}[0]", '-resize', geometry, '-background', 'white',
+                        '-flatten', '-quality', str(DERIVATIVE_QUALITY), f"{fmt}:{target}"],
+                       check=True, capture_output=True)
+
+    def finish(self) -> List[Path]:
+        """Wait for all queued images; return every derivative (created or current)."""
+        if not self.pool:
+            return []
+        created, current = [], []
+        for future in self.futures:
+            result = future.result()
+            created.extend(result['created'])
+            current.extend(result['current'])
+        self.pool.shutdown()
+        print(f"  ✓ Derivatives: {len(created)} created, {len(current)} up to date ({self.backend})")
+        return created + current
+
+
 class ImageExtractor:
     """Extract and download images from Gutenberg books."""
 
-    def __init__(self, book_id: str, output_dir: Path):
+    def __init__(self, book_id: str, output_dir: Path, workers: int = 1,
+                 derivatives: Optional[DerivativeMaker] = None, store: Optional[BlobStore] = None,
+                 archive: Optional['BookArchive'] = None):
         self.book_id = book_id
         self.output_dir = output_dir
         self.images_dir = output_dir / 'images'
+        self.workers = workers
+        self.derivatives = derivatives
+        self.store = store or image_store_for(output_dir.parent)
+        self.archive = archive  # images found in it are not downloaded
         self.downloaded_images = []
+        self.derivative_files = []
         self.cover_image = None
 
-    def download_cover(self) -> Optional[str]:
-        """Download the cover image."""
+    def download_cover(self, cover: Optional[Tuple[str, str]] = None,
+                       prefetched: bool = False) -> Optional[str]:
+        """Download the cover image.
+
+        Args:
+            cover: (url, sha256) tuple from fetch_cover(), if already fetched
+            prefetched: True if the cover was fetched elsewhere (even if None),
+                e.g. concurrently with the HTML
+        """
         self.images_dir.mkdir(parents=True, exist_ok=True)
 
-        # Try medium cover first, then small
-        cover_urls = [
-            GUTENBERG_URLS['cover_medium'].format(id=self.book_id),
-            GUTENBERG_URLS['cover_small'].format(id=self.book_id),
-        ]
+        if not prefetched:
+            cover = fetch_cover(self.book_id, self.store)
+        if cover:
+            url, digest = cover
 
-        for url in cover_urls:
-            print(f"  Trying cover: {url}")
-            content = make_request(url, binary=True)
-            if content:
-                # Determine extension from URL
-                ext = '.jpg'
-                if '.png' in url.lower():
-                    ext = '.png'
+            # Determine extension from URL
+            ext = '.jpg'
+            if '.png' in url.lower():
+                ext = '.png'
 
-                filename = f"cover{ext}"
-                filepath = self.images_dir / filename
+            filename = f"cover{ext}"
+            filepath = self.images_dir / filename
 
-                with open(filepath, 'wb') as f:
-                    f.write(content)
+            self._save(filepath, digest)
 
-                self.cover_image = filename
-                self.downloaded_images.append({
-                    'filename': filename,
-                    'source_url': url,
-                    'type': 'cover'
-                })
-                print(f"  ✓ Downloaded cover: {filename}")
-                return filename
+            self.cover_image = filename
+            self.downloaded_images.append({
+                'filename': filename,
+                'source_url': url,
+                'type': 'cover'
+            })
+            print(f"  ✓ Downloaded cover: {filename}")
+            return filename
 
         print(f"  Warning: No cover image found")
         return None
 
     def extract_images_from_html(self, html_content: str, base_url: str) -> List[Dict]:
         """Extract and download images referenced in HTML content."""
-        self.images_dir.mkdir(parents=True, exist_ok=True)
+        return self.download_images(find_image_refs(html_content), base_url)
 
-        # Find all image tags
-        img_pattern = r'<img[^>]+src=["\']([^"\']+)["\'][^>]*>'
-        matches = re.findall(img_pattern, html_content, re.IGNORECASE)
+    def download_images(self, image_refs: List[Tuple[str, str]], base_url: str) -> List[Dict]:
+        """Download images from (src, alt) pairs collected from the HTML.
 
-        inline_images = []
-        for idx, src in enumerate(matches, 1):
+        Downloads run on up to ``self.workers`` threads, but files are numbered
+        and recorded in document order, so the output is identical to a
+        sequential run.
+        """
+        self.images_dir.mkdir(parents=True, exist_ok=True)
+
+        candidates = []
+        for idx, (src, _alt) in enumerate(image_refs, 1):
             # Skip data URIs
             if src.startswith('data:'):
                 continue
@@ -721,42 +2726,76 @@ class ImageExtractor:
             if not src.startswith('http'):
                 src = urljoin(base_url, src)
 
-            # Download the image
+            candidates.append((idx, src))
+
+        def fetch(candidate: Tuple[int, str]) -> Optional[str]:
+            idx, src = candidate
+            if self.archive and self.archive.member_for(src):
+                print(f"  Extracting image {idx}: {src}")
+                return self.archive.store_member(src, self.store)
             print(f"  Downloading image {idx}: {src}")
-            content = make_request(src, binary=True)
-            if not content:
-                continue
+            return self.store.fetch(src)
 
-            # Determine filename
-            parsed = urlparse(src)
-            original_name = Path(parsed.path).name
-            ext = Path(original_name).suffix or '.jpg'
+        started = time.perf_counter()
+        total_bytes = 0
+        inline_images = []
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            # pool.map yields results in submission order
+            for (idx, src), digest in zip(candidates, pool.map(fetch, candidates)):
+                if not digest:
+                    continue
+
+                # Determine filename
+                parsed = urlparse(src)
+                original_name = Path(parsed.path).name
+                ext = Path(original_name).suffix or '.jpg'
+
+                # Create safe filename
+                safe_name = sanitize_filename(Path(original_name).stem, 30)
+                filename = f"img-{idx:03d}-{safe_name}{ext}"
+                filepath = self.images_dir / filename
 
-            # Create safe filename
-            safe_name = sanitize_filename(Path(original_name).stem, 30)
-            filename = f"img-{idx:03d}-{safe_name}{ext}"
-            filepath = self.images_dir / filename
+                self._save(filepath, digest)
+                total_bytes += self.store.size(digest)
+
+                image_info = {
+                    'filename': filename,
+                    'source_url': src,
+                    'original_name': original_name,
+                    'type': 'inline'
+                }
+                inline_images.append(image_info)
+                self.downloaded_images.append(image_info)
+                print(f"  ✓ Downloaded: {filename}")
+
+        elapsed = time.perf_counter() - started
+        if inline_images:
+            rate = total_bytes / max(elapsed, 1e-9) / 1024
+            print(f"  Downloaded {len(inline_images)} images, {total_bytes / 1024:.0f} KB "
+                  f"in {elapsed:.1f}s ({rate:.0f} KB/s, {self.workers} workers)")
+            if self.archive:
+                print(f"  {self.archive.extracted} of them extracted from the HTML archive")
 
-            with open(filepath, 'wb') as f:
-                f.write(content)
+        return inline_images
 
-            image_info = {
-                'filename': filename,
-                'source_url': src,
-                'original_name': original_name,
-                'type': 'inline'
-            }
-            inline_images.append(image_info)
-            self.downloaded_images.append(image_info)
-            print(f"  ✓ Downloaded: {filename}")
+    def _save(self, filepath: Path, digest: str) -> None:
+        """Place a stored image in images/ (as a link to its blob)."""
+        self.store.link(digest, filepath)
+        if self.derivatives:
+            self.derivatives.submit(filepath)
 
-        return inline_images
+    def finish_derivatives(self) -> List[Path]:
+        """Wait for the derivatives of all downloaded images."""
+        if self.derivatives:
+            self.derivative_files = self.derivatives.finish()
+        return self.derivative_files
 
     def get_results(self) -> Dict:
         """Get summary of downloaded images."""
         return {
             'cover': self.cover_image,
             'images': self.downloaded_images,
+            'derivatives': [str(path.relative_to(self.images_dir)) for path in self.derivative_files],
             'images_dir': str(self.images_dir.relative_to(self.output_dir.parent)) if self.images_dir.exists() else None
         }
 
@@ -772,11 +2811,43 @@ class GutenbergHTMLParser(HTMLParser):
     1. TOC anchor links (most reliable)
     2. Element IDs matching chapter patterns
     3. Heading text matching chapter patterns
+
+    In single-pass mode the parser is fed the raw, uncleaned document and
+    does in one scan what otherwise takes several full-document passes: it
+    finds the START/END text markers (discarding everything before the START
+    marker and ignoring everything after the END marker), collects TOC
+    anchors as the TOC streams by, keeps the raw header lines for body-text
+    metadata, and records Dublin Core meta tags, the <title> and all <img>
+    references. See get_scan_results().
+
+    A link can come after the element it points to ("back to top", a
+    contents list at the end, or no contents block at all), so until a TOC
+    block has ended the single pass keeps the raw text, holds its sections
+    back and notes how each element ID was classified. If the complete
+    anchor set would classify any of them differently, the kept text is
+    parsed again against it (see _settle_toc()).
+
+    With an on_section callback, each finished section is handed off as soon
+    as it closes (see SectionWriter) instead of being kept for get_results().
+    In single-pass mode sections are held back until the START marker, the
+    header lines and the TOC have gone by, since all three can still change
+    what was parsed so far.
     """
 
-    def __init__(self, toc_anchors: List[str] = None):
+    def __init__(self, toc_anchors: List[str] = None, single_pass: bool = False,
+                 on_section: Callable[[Dict], None] = None):
+        self.single_pass = single_pass
+        self.on_section = on_section
+        # Without given anchors, the single pass collects them as the TOC streams by
+        self.toc_locator = TOCLocator() if single_pass and toc_anchors is None else None
+        if not isinstance(toc_anchors, TOCAnchors):
+            toc_anchors = TOCAnchors(toc_anchors or [])
+        self.toc_anchors = toc_anchors
         super().__init__()
-        self.toc_anchors = toc_anchors or []
+
+    def reset(self):
+        """Start a fresh parse (the options and any fixed TOC anchors stay)."""
+        super().reset()
         self.sections = []
         self.current_section = None
         self.current_content = []
@@ -793,14 +2864,206 @@ class GutenbergHTMLParser(HTMLParser):
         self.pending_section_id = None  # ID to use when heading text is captured
         self.pending_section_type = None
 
+        # Single-pass scan state
+        self.start_marker_line = None  # 1-based raw line of the START marker
+        self.end_marker_line = None
+        self.content_ended = False  # END marker seen: no more sections
+        self.image_refs = []  # (src, alt) for every <img>, in document order
+        self.dc_meta = {}  # Dublin Core element -> list of values
+        self._title_parts = []
+        self._in_title = False
+        self._title_seen = False
+        self._header_parts = []  # raw text of the first HEADER_SCAN_LINES lines
+        self._header_lines_left = HEADER_SCAN_LINES if self.single_pass else 0
+        # Until the TOC anchors are complete: the raw text fed so far and the
+        # (element ID, TOC section type) lookups made against partial anchors
+        self._raw_parts = [] if self.toc_locator else None
+        self._toc_lookups = []
+        self._reparse = False  # a lookup was misjudged: parse the raw text again
+        # Whole-book fallback for books without sections, kept alongside
+        # until the first real section turns up (see get_whole_book_content)
+        self.whole_book = WholeBookParser() if self.single_pass else None
+        # HTMLParser may split a text node across feed() calls, so the tail of
+        # the previous piece is carried over to catch markers on the seam
+        self._marker_tail = ''
+
+    def feed(self, data: str) -> None:
+        # Keep the raw header lines for extract_metadata_from_body_text()
+        if self._header_lines_left > 0:
+            idx = -1
+            for _ in range(self._header_lines_left):
+                idx = data.find('\n', idx + 1)
+                if idx == -1:
+                    break
+            if idx == -1:
+                self._header_parts.append(data)
+                self._header_lines_left -= data.count('\n')
+            else:
+                self._header_parts.append(data[:idx])
+                self._header_lines_left = 0
+        if self._raw_parts is not None:
+            self._raw_parts.append(data)
+        super().feed(data)
+        if self._reparse:
+            self._parse_again()
+
+    def close(self):
+        super().close()
+        if self.toc_locator:
+            # No TOC block, or one that never ended: the anchors are final now
+            self._settle_toc()
+        if self._reparse:
+            self._parse_again()
+            super().close()
+
+    def _settle_toc(self):
+        """Fix the TOC anchors once they are complete.
+
+        If every element ID looked up so far gets the same answer from them,
+        parsing simply carries on against them. Otherwise the kept raw text
+        is parsed again from the start when the current feed() returns.
+        """
+        anchors = self.toc_locator.anchors
+        self._reparse = any(anchors.section_type(element_id) != section_type
+                            for element_id, section_type in self._toc_lookups)
+        self.toc_anchors = anchors
+        self.toc_locator = None
+        self._toc_lookups = []
+        if not self._reparse:
+            self._raw_parts = None
+            if self.on_section and self._hand_off_ready():
+                self._hand_off_sections()
+
+    def _parse_again(self):
+        """Parse the kept raw text again, against the settled TOC anchors."""
+        raw = ''.join(self._raw_parts)
+        self.reset()
+        self.feed(raw)
+
     def _check_element_id(self, element_id: str) -> Tuple[bool, str]:
         """Check if element ID indicates a section boundary."""
-        return is_section_id(element_id, self.toc_anchors)
+        if self.toc_locator:
+            section_type = self.toc_locator.anchors.section_type(element_id)
+            self._toc_lookups.append((element_id, section_type))
+        else:
+            section_type = self.toc_anchors.section_type(element_id)
+        if section_type is not None:
+            return bool(section_type), section_type
+        return is_section_id(element_id)
+
+    def _reset_content(self):
+        """Discard everything parsed so far (it was header boilerplate)."""
+        self.sections = []
+        self.current_section = None
+        self.current_content = []
+        self.in_toc = False
+        self.in_heading = False
+        self.current_heading_tag = None
+        self.pending_heading_text = []
+        self.pending_section_id = None
+        self.pending_section_type = None
+        if self.whole_book:
+            self.whole_book.reset_content()
+        elif self.single_pass:
+            # The sections that dropped the fallback were header boilerplate
+            self.whole_book = WholeBookParser()
+            self.whole_book.in_boilerplate = self.in_boilerplate
+            self.whole_book.boilerplate_depth = self.boilerplate_depth
+
+    # Tags _scan_starttag() looks at once the TOC locator is done
+    SCAN_TAGS = frozenset(('img', 'meta', 'title'))
+
+    def _scan_starttag(self, tag, attrs_dict):
+        if self.toc_locator:
+            self.toc_locator.scan_starttag(tag, attrs_dict)
+            if self.toc_locator.complete:
+                self._settle_toc()
+        if tag == 'img':
+            if attrs_dict.get('src'):
+                self.image_refs.append((attrs_dict['src'], attrs_dict.get('alt') or ''))
+        elif tag == 'meta':
+            name = (attrs_dict.get('name') or '').lower()
+            if name.startswith('dc.') and attrs_dict.get('content'):
+                self.dc_meta.setdefault(name[3:], []).append(attrs_dict['content'])
+        elif tag == 'title' and not self._title_seen:
+            self._in_title = True
+
+    def _scan_endtag(self, tag):
+        if self.toc_locator:
+            self.toc_locator.scan_endtag(tag)
+            if self.toc_locator.complete:
+                self._settle_toc()
+        if tag == 'title' and self._in_title:
+            self._in_title = False
+            self._title_seen = True
+
+    def _scan_data(self, data) -> bool:
+        """Track text markers. Returns True if the data is a marker (to drop)."""
+        if self._in_title:
+            self._title_parts.append(data)
+        if self.toc_locator:
+            self.toc_locator.scan_data(data)
+
+        if self.content_ended:
+            return False
+
+        # Most text follows a tag (which clears the tail), so it is searched
+        # as is; the tail is only cut down when a text node was split
+        tail = self._marker_tail
+        if tail:
+            tail = tail[-MARKER_TAIL_CHARS:]
+            text = tail + data
+        else:
+            text = data
+        self._marker_tail = text
+        text_upper = text.upper()
+        if END_MARKER_GATE not in text_upper and (
+                self.start_marker_line is not None
+                or not any(word in text_upper for word in START_MARKER_GATE)):
+            return False
+
+        line = self.getpos()[0]
+        tail_len = len(tail.upper())
+
+        def marker_line(idx):
+            # Markers are single-line: one starting in the carried tail is on
+            # the line where this piece of text starts
+            return line + data.count('\n', 0, max(idx - tail_len, 0))
+
+        if self.start_marker_line is None:
+            idx = find_marker(text_upper, START_MARKERS_UPPER)
+            if idx >= 0:
+                self.start_marker_line = marker_line(idx)
+                self._reset_content()
+                self._marker_tail = ''
+                return True
+
+        # Only check after line 100 to avoid false positives
+        if line + data.count('\n') > FOOTER_MIN_LINE:
+            idx = find_marker(text_upper, END_MARKERS_UPPER)
+            if idx >= 0:
+                end_line = marker_line(idx)
+                if end_line > FOOTER_MIN_LINE and end_line > (self.start_marker_line or 0):
+                    self.end_marker_line = end_line
+                    self._save_section()
+                    self.content_ended = True
+                    return True
+
+        return False
 
     def handle_starttag(self, tag, attrs):
         attrs_dict = dict(attrs)
         self.tag_stack.append(tag)
 
+        if self.single_pass:
+            self._marker_tail = ''
+            if self.toc_locator or tag in self.SCAN_TAGS:
+                self._scan_starttag(tag, attrs_dict)
+            if self.content_ended:
+                return
+            if self.whole_book:
+                self.whole_book.handle_starttag(tag, attrs)
+
         # Handle boilerplate sections
         if 'class' in attrs_dict and 'pg-boilerplate' in attrs_dict['class']:
             self.in_boilerplate = True
@@ -889,6 +3152,15 @@ class GutenbergHTMLParser(HTMLParser):
         if self.tag_stack and self.tag_stack[-1] == tag:
             self.tag_stack.pop()
 
+        if self.single_pass:
+            self._marker_tail = ''
+            if self.toc_locator or self._in_title:
+                self._scan_endtag(tag)
+            if self.content_ended:
+                return
+            if self.whole_book:
+                self.whole_book.handle_endtag(tag)
+
         # Track boilerplate depth
         if self.in_boilerplate and tag in ('div', 'section'):
             self.boilerplate_depth -= 1
@@ -998,6 +3270,20 @@ class GutenbergHTMLParser(HTMLParser):
                 self.current_content.append('**')
 
     def handle_data(self, data):
+        if self.single_pass:
+            # Most text is outside the <title> and the TOC and cannot hold a
+            # marker: then only the seam tail is kept, without a call
+            if (self._in_title or self.toc_locator or self._marker_tail
+                    or self.start_marker_line is None or END_MARKER_GATE in data.upper()):
+                if self._scan_data(data) or self.content_ended:
+                    return
+            elif self.content_ended:
+                return
+            else:
+                self._marker_tail = data
+        if self.whole_book:
+            self.whole_book.handle_data(data)
+
         # Always collect heading text for chapter detection (even before we have a section)
         if self.in_heading and data:
             self.pending_heading_text.append(data)
@@ -1028,20 +3314,69 @@ class GutenbergHTMLParser(HTMLParser):
             })
 
         self.current_section = None
+        if content and self.whole_book:
+            # The book has sections after all: no fallback needed (a START
+            # marker found later starts a new one, see _reset_content)
+            self.whole_book = None
+        if self.on_section and self._hand_off_ready():
+            self._hand_off_sections()
+
+    def _hand_off_ready(self) -> bool:
+        """Whether nothing still to come can change the sections parsed so far."""
+        return not self.single_pass or bool(
+            self.start_marker_line and not self._header_lines_left and not self.toc_locator)
+
+    def _hand_off_sections(self):
+        """Pass finished sections to on_section, dropping them here."""
+        sections, self.sections = self.sections, []
+        for section in sections:
+            self.on_section(section)
 
     def get_results(self) -> Tuple[List[Dict], List[Dict], List[str]]:
-        """Get parsed sections."""
+        """Get parsed sections (none are kept when on_section is set)."""
         if self.current_section:
             self._save_section()
+        if self.on_section:
+            self._hand_off_sections()
 
         front_matter = [s for s in self.sections if s['type'] == 'front_matter']
         chapters = [s for s in self.sections if s['type'] in ('chapter', 'part', 'back_matter')]
 
         return front_matter, chapters, self.images_found
 
+    def get_whole_book_content(self) -> str:
+        """Get the book as one markdown document, for books without sections.
+
+        Collected during the same pass (single-pass mode), between the
+        START and END markers; empty once a section has been found.
+        """
+        return self.whole_book.get_content() if self.whole_book else ''
+
+    def get_scan_results(self) -> Dict[str, Any]:
+        """Get what a single-pass parse collected besides the sections.
+
+        Returns a dict with 'header_text' (raw first lines, for
+        extract_metadata_from_body_text), 'dc_meta' and 'page_title' (for
+        MetadataExtractor.apply_html_meta), 'image_refs' ((src, alt) pairs),
+        'toc_anchors', and the 1-based 'start_marker_line'/'end_marker_line'.
+        """
+        return {
+            'header_text': ''.join(self._header_parts),
+            'dc_meta': self.dc_meta,
+            'page_title': ''.join(self._title_parts) or None,
+            'image_refs': self.image_refs,
+            'toc_anchors': list(self.toc_locator.anchors if self.toc_locator else self.toc_anchors),
+            'start_marker_line': self.start_marker_line,
+            'end_marker_line': self.end_marker_line,
+        }
+
 
 class WholeBookParser(HTMLParser):
-    """Extract entire book as single section when no chapters found."""
+    """Extract entire book as single section when no chapters found.
+
+    GutenbergHTMLParser drives one of these event by event in single-pass
+    mode, so the fallback costs no second parse.
+    """
 
     def __init__(self):
         super().__init__()
@@ -1110,6 +3445,11 @@ class WholeBookParser(HTMLParser):
         if not self.in_boilerplate and data:
             self.current_text.append(data)
 
+    def reset_content(self):
+        """Discard the text collected so far (it was header boilerplate)."""
+        self.content = []
+        self.current_text = []
+
     def get_content(self) -> str:
         return ''.join(self.content).strip()
 
@@ -1282,8 +3622,8 @@ def create_cb_essay_book_yml(metadata: Dict, image_urls: Dict, sections_info: Di
     return '\n'.join(lines) + '\n'
 
 
-def create_cb_essay_markdown(section: Dict, order: int) -> str:
-    """Create markdown file for CB-Essay _essay folder (simplified front matter)."""
+def create_cb_essay_front_matter(section: Dict, order: int) -> str:
+    """Create the front matter of a CB-Essay _essay file (simplified)."""
     title = normalize_text(section['title'], for_yaml=True)
 
     fm_lines = ['---']
@@ -1292,7 +3632,12 @@ def create_cb_essay_markdown(section: Dict, order: int) -> str:
     fm_lines.append('---')
     fm_lines.append('')
 
-    return '\n'.join(fm_lines) + section['content']
+    return '\n'.join(fm_lines)
+
+
+def create_cb_essay_markdown(section: Dict, order: int) -> str:
+    """Create markdown file for CB-Essay _essay folder (simplified front matter)."""
+    return create_cb_essay_front_matter(section, order) + section['content']
 
 
 def save_cb_essay_files(front_matter: List[Dict], chapters: List[Dict],
@@ -1306,43 +3651,29 @@ def save_cb_essay_files(front_matter: List[Dict], chapters: List[Dict],
         metadata: Book metadata dict
         image_urls: Dict with 'cover_urls' and 'inline_images' (URLs, not downloaded)
     """
-    essay_dir = project_root / '_essay'
-    data_dir = project_root / '_data'
-
-    # Create directories
-    essay_dir.mkdir(parents=True, exist_ok=True)
-    data_dir.mkdir(parents=True, exist_ok=True)
-
-    all_sections = front_matter + chapters
-    saved_files = []
-
     print(f"\nSaving {len(front_matter)} front matter + {len(chapters)} chapters to _essay/...")
 
-    for idx, section in enumerate(all_sections, 1):
-        # Create filename with order prefix
-        if idx <= len(front_matter):
-            number = f"00-{idx:02d}"
-        else:
-            number = f"{idx - len(front_matter):02d}"
-
-        filename = f"{number}-{sanitize_filename(section['title'])}.md"
-        filepath = essay_dir / filename
+    essay_dir = project_root / '_essay'
+    essay_dir.mkdir(parents=True, exist_ok=True)
+    writer = SectionWriter(lambda: (essay_dir, metadata), cb_essay=True)
+    for section in front_matter + chapters:
+        writer.write(section)
+    saved_files = writer.finish()
 
-        content = create_cb_essay_markdown(section, idx)
+    yaml_path = save_cb_essay_book_yml(project_root, metadata, image_urls, writer.sections_info())
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+    return {
+        'essay_files': saved_files,
+        'book_yml': str(yaml_path),
+        'image_urls': image_urls
+    }
 
-        saved_files.append(filename)
-        print(f"  ✓ _essay/{filename}")
 
-    # Create book.yml in _data (with image URLs, not downloaded files)
-    sections_info = {
-        'front_matter_count': len(front_matter),
-        'chapter_count': len(chapters),
-        'total_sections': len(all_sections),
-        'files': saved_files
-    }
+def save_cb_essay_book_yml(project_root: Path, metadata: Dict, image_urls: Dict,
+                           sections_info: Dict) -> Path:
+    """Write _data/book.yml (with image URLs, not downloaded files)."""
+    data_dir = project_root / '_data'
+    data_dir.mkdir(parents=True, exist_ok=True)
 
     # Report image URLs found
     if image_urls.get('cover_urls'):
@@ -1353,19 +3684,14 @@ def save_cb_essay_files(front_matter: List[Dict], chapters: List[Dict],
     yaml_content = create_cb_essay_book_yml(metadata, image_urls, sections_info)
     yaml_path = data_dir / 'book.yml'
 
-    with open(yaml_path, 'w', encoding='utf-8') as f:
-        f.write(yaml_content)
-    print(f"\n  ✓ _data/book.yml")
+    changed = write_if_changed(yaml_path, yaml_content, ignore=EXTRACTED_AT_RE)
+    print(f"\n  ✓ _data/book.yml{'' if changed else ' (unchanged)'}")
 
-    return {
-        'essay_files': saved_files,
-        'book_yml': str(yaml_path),
-        'image_urls': image_urls
-    }
+    return yaml_path
 
 
-def create_markdown_file(section: Dict, metadata: Dict, order: int) -> str:
-    """Create markdown file content with front matter."""
+def create_markdown_front_matter(section: Dict, metadata: Dict, order: int) -> str:
+    """Create the front matter of a section's markdown file."""
     title = normalize_text(section['title'], for_yaml=True)
 
     fm_lines = ['---']
@@ -1379,46 +3705,552 @@ def create_markdown_file(section: Dict, metadata: Dict, order: int) -> str:
     fm_lines.append('---')
     fm_lines.append('')
 
-    return '\n'.join(fm_lines) + section['content']
+    return '\n'.join(fm_lines)
+
+
+def create_markdown_file(section: Dict, metadata: Dict, order: int) -> str:
+    """Create markdown file content with front matter."""
+    return create_markdown_front_matter(section, metadata, order) + section['content']
+
+
+class SectionWriter:
+    """Write sections to markdown files as soon as the parser finishes them.
+
+    Pass write() as GutenbergHTMLParser's on_section callback: each section is
+    streamed to disk with its front matter and dropped, so memory stays at
+    about one chapter whatever the size of the book. Only titles and
+    filenames are kept, for the index files.
+
+    prepare() is called before the first write and returns the output
+    directory and the book metadata, so both can be settled while the parse
+    is already running.
+
+    Files are named as before: front matter 00-NN-title.md, chapters (and
+    parts, back matter) NN-title.md, with `order` counting front matter
+    first. If front matter turns up after chapters were written, finish()
+    corrects those chapters' `order`.
+    """
+
+    def __init__(self, prepare: Callable[[], Tuple[Path, Dict]], cb_essay: bool = False):
+        self.prepare = prepare
+        self.cb_essay = cb_essay
+        self.output_dir = None
+        self.metadata = None
+        self.front_matter = []  # {'id', 'title', 'type', 'filename'} per written file
+        self.chapters = []
+        self._chapter_front_counts = []  # front matter count each chapter's order assumed
+
+    def write(self, section: Dict) -> None:
+        if section['type'] == 'front_matter':
+            number = f"00-{len(self.front_matter) + 1:02d}"
+            order = len(self.front_matter) + 1
+            written = self.front_matter
+        elif section['type'] in ('chapter', 'part', 'back_matter'):
+            number = f"{len(self.chapters) + 1:02d}"
+            order = len(self.front_matter) + len(self.chapters) + 1
+            written = self.chapters
+            self._chapter_front_counts.append(len(self.front_matter))
+        else:
+            return
+
+        if self.output_dir is None:
+            self.output_dir, self.metadata = self.prepare()
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        filename = f"{number}-{sanitize_filename(section['title'])}.md"
+        if self.cb_essay:
+            header = create_cb_essay_front_matter(section, order)
+        else:
+            header = create_markdown_front_matter(section, self.metadata, order)
+
+        changed = write_if_changed(self.output_dir / filename, header + section['content'])
+
+        written.append({'id': section['id'], 'title': section['title'],
+                        'type': section['type'], 'filename': filename})
+        print(f"  ✓ {'_essay/' if self.cb_essay else ''}{filename}{'' if changed else ' (unchanged)'}")
+
+    def finish(self) -> List[str]:
+        """Fix up chapter order if needed; return all filenames, front matter first."""
+        for idx, (chapter, front_count) in enumerate(zip(self.chapters, self._chapter_front_counts), 1):
+            if front_count != len(self.front_matter):
+                self._rewrite_order(self.output_dir / chapter['filename'], len(self.front_matter) + idx)
+        self._chapter_front_counts = [len(self.front_matter)] * len(self.chapters)
+        return [s['filename'] for s in self.front_matter + self.chapters]
+
+    def sections_info(self) -> Dict:
+        return {
+            'front_matter_count': len(self.front_matter),
+            'chapter_count': len(self.chapters),
+            'total_sections': len(self.front_matter) + len(self.chapters),
+            'files': [s['filename'] for s in self.front_matter + self.chapters]
+        }
+
+    @staticmethod
+    def _rewrite_order(path: Path, order: int) -> None:
+        """Replace the `order:` front matter line of a written file."""
+        with open(path, 'rb') as f:
+            content = f.read()
+        content = re.sub(rb'^order: .*$', f'order: {order}'.encode(), content, count=1, flags=re.MULTILINE)
+        write_if_changed(path, content)
 
 
 def save_markdown_files(front_matter: List[Dict], chapters: List[Dict],
                         output_dir: Path, metadata: Dict) -> List[str]:
     """Save all markdown files and return list of filenames."""
+    print(f"\nSaving {len(front_matter)} front matter sections and {len(chapters)} chapters...")
+
     output_dir.mkdir(parents=True, exist_ok=True)
+    writer = SectionWriter(lambda: (output_dir, metadata))
+    for section in front_matter + chapters:
+        writer.write(section)
+    return writer.finish()
 
-    all_sections = front_matter + chapters
-    saved_files = []
 
-    print(f"\nSaving {len(front_matter)} front matter sections and {len(chapters)} chapters...")
+# =============================================================================
+# Extraction Manifest
+# =============================================================================
 
-    for idx, section in enumerate(all_sections, 1):
-        # Create filename
-        if idx <= len(front_matter):
-            number = f"00-{idx:02d}"
-        else:
-            number = f"{idx - len(front_matter):02d}"
+class ExtractionManifest:
+    """Record of what one book's last extraction read and wrote.
+
+    Stored as <base>/.gutenberg-manifest/pg<ID>.json, where base is the output
+    base directory (CB-Essay mode: the project root). It holds the parser
+    version, the options that shape the output, a hash of every source
+    (HTML, metadata responses, cover) and a hash of every output file.
+    A re-run whose sources and options match and whose outputs are intact
+    has nothing to do; otherwise outputs are rewritten only where their
+    bytes differ, and files the previous run wrote but this one did not
+    are removed.
+    """
 
-        filename = f"{number}-{sanitize_filename(section['title'])}.md"
-        filepath = output_dir / filename
+    def __init__(self, base: Path, book_id: str):
+        self.base = base
+        self.book_id = book_id
+        self.path = base / MANIFEST_DIR / f"pg{book_id}.json"
+        self.previous = self._load()
+
+    def _load(self) -> Optional[Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_current(self, sources: Dict, options: Dict) -> bool:
+        """True if the last extraction had the same inputs and its outputs are untouched."""
+        previous = self.previous
+        if not previous or previous.get('parser_version') != PARSER_VERSION \
+                or previous.get('options') != options or previous.get('sources') != sources:
+            return False
+        for name, digest in previous.get('outputs', {}).items():
+            try:
+                if file_digest(self.base / name) != digest:
+                    return False
+            except OSError:
+                return False
+        return True
 
-        content = create_markdown_file(section, metadata, idx)
+    def save(self, sources: Dict, options: Dict, outputs: List[Path]) -> None:
+        """Record this extraction and remove outputs the previous one left behind."""
+        recorded = {}
+        for path in outputs:
+            recorded[path.relative_to(self.base).as_posix()] = file_digest(path)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        for name in (self.previous or {}).get('outputs', {}):
+            if name not in recorded and (self.base / name).is_file():
+                (self.base / name).unlink()
+                print(f"  ✓ Removed stale {name}")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.path, json.dumps({
+            'book_id': self.book_id,
+            'parser_version': PARSER_VERSION,
+            'options': options,
+            'sources': sources,
+            'outputs': recorded,
+        }, indent=2, sort_keys=True) + '\n')
+
+
+# =============================================================================
+# Progress Journal
+# =============================================================================
+
+class ExtractionJournal:
+    """Append-only log of each book's progress, for resuming an interrupted run.
+
+    Only kept with --resume. Lives in .gutenberg-journal/journal.jsonl under
+    the output base (CB-Essay mode: the project root): one JSON line per
+    completed stage ('fetched', 'parsed', 'written'), flushed and synced as
+    it is written, so a crash loses at most the stage in progress. The
+    fetched HTML is kept next to it (pg<ID>.html) until the book is written,
+    so a resumed book does not download it again. A book's latest line
+    wins; a truncated last line from a crash is ignored.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.path = self.directory / 'journal.jsonl'
+        self.lock = threading.Lock()
+        self.states = self._load()
+
+    def __reduce__(self):
+        # Sent to batch worker processes by directory; each reloads the journal
+        return ExtractionJournal, (self.directory,)
 
-        saved_files.append(filename)
-        print(f"  ✓ {filename}")
+    def _load(self) -> Dict[str, Dict]:
+        states = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    states[entry['book_id']] = entry
+        except OSError:
+            pass
+        return states
+
+    def record(self, book_id: str, stage: str, **details) -> None:
+        """Append a book's newly completed stage."""
+        entry = {'book_id': book_id, 'stage': stage,
+                 'time': datetime.now().isoformat(timespec='seconds'), **details}
+        with self.lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.states[book_id] = entry
+        if stage == 'written':
+            with contextlib.suppress(OSError):
+                self.html_path(book_id).unlink()
+
+    def last_stage(self, book_id: str) -> Optional[Dict]:
+        """The latest journal entry of a book, or None."""
+        return self.states.get(book_id)
+
+    def html_path(self, book_id: str) -> Path:
+        return self.directory / f"pg{book_id}.html"
+
+    def fetched_html(self, book_id: str) -> Optional[Tuple[Path, str]]:
+        """(path, source url) of HTML kept from an unfinished run, or None."""
+        entry = self.last_stage(book_id)
+        path = self.html_path(book_id)
+        if entry and entry['stage'] in ('fetched', 'parsed') and entry.get('url') and path.exists():
+            return path, entry['url']
+        return None
+
+    def keep_html(self, book_id: str, content: bytes) -> None:
+        """Keep a downloaded book's HTML until it is written."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.html_path(book_id), content)
+
+    def keep_stream(self, book_id: str, chunks):
+        """Pass streamed HTML chunks through while keeping a copy.
+
+        The copy only replaces the kept file once the stream is complete.
+        """
+        path = self.html_path(book_id)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{path.name}.", suffix='.tmp')
+        completed = False
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+            completed = True
+        finally:
+            with contextlib.suppress(OSError):
+                if completed:
+                    publish_mode(tmp_path, path)
+                    os.replace(tmp_path, path)
+                else:
+                    os.unlink(tmp_path)
+
+
+# =============================================================================
+# Profiling
+# =============================================================================
+
+class StageProfiler:
+    """Per-stage wall and CPU time for one extract_book() run (--profile).
+
+    Stages nest: time spent in an inner stage (a section written from inside
+    the parse, a chunk read from a streaming download) is charged to the
+    inner stage only, so the stage totals add up. CPU time is per thread;
+    stages running concurrently in the fetch pool each count their own wall
+    time. With trace_parse, the parse also runs under cProfile and
+    tracemalloc.
+    """
+
+    def __init__(self, book_id: str = None, report_path: str = None,
+                 trace_parse: bool = False, top: int = PROFILE_TOP, enabled: bool = True):
+        self.book_id = book_id
+        self.report_path = Path(report_path) if report_path else None
+        self.trace_parse = trace_parse
+        self.top = top
+        self.enabled = enabled
+        self.stages = {name: {'wall': 0.0, 'cpu': 0.0, 'calls': 0} for name in PROFILE_STAGES}
+        self.profile = None
+        self.parse_trace = None
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+
+    @classmethod
+    def for_book(cls, book_id: str, output_base: str, trace_parse: bool = False,
+                 top: int = PROFILE_TOP) -> 'StageProfiler':
+        """Profiler reporting to <output_base>/profile-pg<id>.json."""
+        return cls(book_id, Path(output_base) / f"profile-pg{book_id}.json", trace_parse, top)
+
+    def stage(self, name: str):
+        """Context manager charging the enclosed block to a stage."""
+        return self._measure(name) if self.enabled else contextlib.nullcontext()
+
+    @contextlib.contextmanager
+    def _measure(self, name: str):
+        stack = self.local.__dict__.setdefault('stack', [])
+        inner = [0.0, 0.0]  # wall, CPU charged to nested stages
+        stack.append(inner)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            stack.pop()
+            if stack:
+                stack[-1][0] += wall
+                stack[-1][1] += cpu
+            with self.lock:
+                entry = self.stages.setdefault(name, {'wall': 0.0, 'cpu': 0.0, 'calls': 0})
+                entry['wall'] += wall - inner[0]
+                entry['cpu'] += cpu - inner[1]
+                entry['calls'] += 1
+
+    def timed(self, name: str, func: Callable) -> Callable:
+        """Wrap func so every call is charged to a stage (in any thread)."""
+        if not self.enabled:
+            return func
+
+        def wrapper(*args, **kwargs):
+            with self._measure(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def iterate(self, name: str, iterable):
+        """Yield from iterable, charging the time spent producing items to a stage."""
+        if not self.enabled:
+            yield from iterable
+            return
+        iterator = iter(iterable)
+        while True:
+            with self._measure(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    @contextlib.contextmanager
+    def trace(self):
+        """Run the enclosed block under cProfile and tracemalloc (trace_parse only)."""
+        if not (self.enabled and self.trace_parse):
+            yield
+            return
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        try:
+            yield
+        finally:
+            self.profile.disable()
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__)])
+            peak = tracemalloc.get_traced_memory()[1]
+            if not was_tracing:
+                tracemalloc.stop()
+            self.parse_trace = {
+                'traced_peak_mb': round(peak / 1024 / 1024, 2),
+                'hot_functions': self._hot_functions(),
+                'allocation_sites': [{
+                    'site': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    'size_kb': round(stat.size / 1024, 1),
+                    'count': stat.count,
+                } for stat in snapshot.statistics('lineno')[:self.top]],
+            }
+
+    def _hot_functions(self) -> List[Dict]:
+        """Top functions of the parse profile by self time."""
+        stats = pstats.Stats(self.profile).stats
+        ranked = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+        return [{
+            'function': f"{filename}:{lineno}({func})",
+            'calls': calls,
+            'self_seconds': round(self_time, 4),
+            'cumulative_seconds': round(cumulative, 4),
+        } for (filename, lineno, func), (_, calls, self_time, cumulative, _) in ranked[:self.top]]
+
+    def get_report(self) -> Dict:
+        """Machine-readable report of the run so far."""
+        report = {
+            'book_id': self.book_id,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'wall_seconds': round(time.perf_counter() - self.started, 4),
+            'cpu_seconds': round(time.process_time() - self.cpu_started, 4),
+            'stages': {name: {
+                'wall_seconds': round(entry['wall'], 4),
+                'cpu_seconds': round(entry['cpu'], 4),
+                'calls': entry['calls'],
+            } for name, entry in self.stages.items()},
+        }
+        if self.parse_trace:
+            report['parse_trace'] = self.parse_trace
+        return report
+
+    def save(self) -> Dict:
+        """Print the stage table and write the JSON report (and .prof stats)."""
+        report = self.get_report()
+        print(f"\nProfile for book #{self.book_id}:")
+        print(f"  {'Stage':<10} {'Wall':>9} {'CPU':>9} {'Calls':>7}")
+        for name, entry in report['stages'].items():
+            print(f"  {name:<10} {entry['wall_seconds']:>8.3f}s {entry['cpu_seconds']:>8.3f}s {entry['calls']:>7}")
+        print(f"  {'total':<10} {report['wall_seconds']:>8.3f}s {report['cpu_seconds']:>8.3f}s")
+
+        if self.parse_trace:
+            print(f"\n  Parse hot functions (self time, top {self.top}):")
+            for entry in self.parse_trace['hot_functions']:
+                print(f"    {entry['self_seconds']:>8.3f}s {entry['calls']:>9}  {entry['function']}")
+            print(f"\n  Parse allocation sites (live at end of parse, top {self.top}):")
+            for entry in self.parse_trace['allocation_sites']:
+                print(f"    {entry['size_kb']:>9.1f} KB {entry['count']:>8}  {entry['site']}")
+            print(f"  Traced peak during parse: {self.parse_trace['traced_peak_mb']} MB")
+
+        if self.report_path:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.report_path, json.dumps(report, indent=2))
+            print(f"  ✓ Profile report: {self.report_path}")
+            if self.profile:
+                stats_path = self.report_path.with_suffix('.prof')
+                self.profile.dump_stats(str(stats_path))
+                print(f"  ✓ Parse profile (pstats): {stats_path}")
+        return report
+
+
+# =============================================================================
+# HTML Zip Archives
+# =============================================================================
+
+class BookArchive:
+    """Gutenberg's HTML zip of a book (<ID>-h.zip): the HTML and all of its images.
 
-    return saved_files
+    The archive holds the book's directory as published, so each member has
+    a URL under base_url (the directory the zip came from). Image references
+    resolved against html_url() are then read from their members instead
+    of being downloaded one request at a time.
+    """
+
+    def __init__(self, path: Path, base_url: str, digest: str = None):
+        self.path = Path(path)
+        self.base_url = base_url
+        self.zip = zipfile.ZipFile(self.path)
+        self.members = {info.filename: info for info in self.zip.infolist() if not info.is_dir()}
+        self.html_member = self._find_html()
+        self.digest = digest or file_digest(self.path)
+        self.extracted = 0
+        self._lock = threading.Lock()
+
+    def _find_html(self) -> Optional[str]:
+        # The book itself: a <ID>-h.htm / -images.html name if there is one, else the largest page
+        pages = [name for name in self.members if name.lower().endswith(('.htm', '.html'))]
+        if not pages:
+            return None
+        return max(pages, key=lambda name: (bool(re.search(r'-(?:h|images)\.html?$', name, re.IGNORECASE)),
+                                            self.members[name].file_size))
+
+    def html_url(self) -> str:
+        return urljoin(self.base_url, quote(self.html_member))
+
+    def open_html(self):
+        """The HTML member as bytes chunks, decompressed as they are read."""
+        return iter_file_chunks(self.zip.open(self.html_member))
+
+    def read_html(self) -> bytes:
+        return b''.join(self.open_html())
+
+    def member_for(self, url: str) -> Optional[str]:
+        """Name of the member behind a URL under base_url, or None if the archive lacks it."""
+        if not url.startswith(self.base_url):
+            return None
+        name = unquote(urlparse(url[len(self.base_url):]).path)
+        return name if name in self.members else None
+
+    def store_member(self, url: str, store: BlobStore) -> Optional[str]:
+        """Copy the member behind url into store; return its hash (None if it is not in the archive)."""
+        name = self.member_for(url)
+        if name is None:
+            return None
+        digest = store.add(iter_file_chunks(self.zip.open(name)))
+        with self._lock:
+            self.extracted += 1
+        return digest
+
+    def close(self) -> None:
+        self.zip.close()
+
+
+def load_archive(path: Path, base_url: str, digest: str = None) -> Optional[BookArchive]:
+    """Open an HTML zip, or return None (with a warning) if it is unusable."""
+    try:
+        archive = BookArchive(path, base_url, digest)
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f"  Warning: Cannot read archive {path}: {e}")
+        return None
+    if archive.html_member is None:
+        print(f"  Warning: No HTML file in archive {path}")
+        archive.close()
+        return None
+    return archive
+
+
+def download_archive(book_id: str, store: BlobStore) -> Optional[BookArchive]:
+    """Download the book's HTML zip into store (one request for the HTML and every image).
+
+    Re-runs reuse the stored zip only within the HTTP cache TTL; after that
+    BlobStore.fetch() revalidates it, so archive.digest - the manifest's
+    'archive' source - follows an updated zip.
+
+    Returns the opened archive, or None if Gutenberg has none for the book.
+    """
+    urls = [
+        GUTENBERG_URLS['html_zip'].format(id=book_id),
+        GUTENBERG_URLS['html_zip_generated'].format(id=book_id),
+    ]
+
+    for url in urls:
+        print(f"  Trying: {url}")
+        digest = store.fetch(url)
+        if digest:
+            archive = load_archive(store.blob_path(digest), urljoin(url, '.'), digest)
+            if archive:
+                print(f"  ✓ Downloaded HTML archive from {url} ({len(archive.members)} files)")
+                return archive
+
+    return None
 
 
 # =============================================================================
 # Main Extraction Process
 # =============================================================================
 
-def download_html(book_id: str) -> Tuple[Optional[str], Optional[str]]:
-    """Download HTML content from Project Gutenberg."""
+def download_html(book_id: str) -> Tuple[Optional[bytes], Optional[str]]:
+    """Download HTML content (undecoded) from Project Gutenberg."""
     urls = [
         GUTENBERG_URLS['html_images'].format(id=book_id),
         GUTENBERG_URLS['html_simple'].format(id=book_id),
@@ -1427,7 +4259,7 @@ def download_html(book_id: str) -> Tuple[Optional[str], Optional[str]]:
 
     for url in urls:
         print(f"  Trying: {url}")
-        content = make_request(url)
+        content = make_request(url, binary=True)
         if content:
             print(f"  ✓ Downloaded HTML from {url}")
             return content, url
@@ -1435,10 +4267,55 @@ def download_html(book_id: str) -> Tuple[Optional[str], Optional[str]]:
     return None, None
 
 
+def open_html_stream(book_id: str) -> Tuple[Any, Optional[str]]:
+    """Open the book HTML for incremental reading (streaming download_html).
+
+    Returns (chunks, url) tuple, or (None, None) if no source is available.
+    """
+    urls = [
+        GUTENBERG_URLS['html_images'].format(id=book_id),
+        GUTENBERG_URLS['html_simple'].format(id=book_id),
+        GUTENBERG_URLS['html_alt'].format(id=book_id),
+    ]
+
+    for url in urls:
+        print(f"  Trying: {url}")
+        chunks = open_stream(url)
+        if chunks is not None:
+            print(f"  ✓ Streaming HTML from {url}")
+            return chunks, url
+
+    return None, None
+
+
+def feed_parser(parser: HTMLParser, chunks) -> int:
+    """Decode UTF-8 byte chunks incrementally and feed them to a parser.
+
+    Parsing proceeds as the bytes arrive, so a download overlaps with the
+    parse and the whole document is not held in memory (a single-pass
+    parser keeps the text only until the TOC has gone by). Closes the parser
+    and returns the number of bytes consumed.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    total = 0
+    for chunk in chunks:
+        total += len(chunk)
+        text = decoder.decode(chunk)
+        if text:
+            parser.feed(text)
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    return total
+
+
 def extract_book(book_id: str, output_base: str = './books', slug: str = None,
                  skip_images: bool = False, download_all_images: bool = False,
                  local_html: str = None, cb_essay: bool = False,
-                 project_root: str = None) -> bool:
+                 project_root: str = None, image_workers: int = DEFAULT_IMAGE_WORKERS,
+                 catalog_db: str = None, stream: bool = False,
+                 profiler: Optional[StageProfiler] = None,
+                 journal: Optional[ExtractionJournal] = None, resume: bool = False,
+                 derivatives: bool = False, webp: bool = False, html_zip: bool = False) -> bool:
     """
     Main extraction function.
 
@@ -1448,9 +4325,20 @@ def extract_book(book_id: str, output_base: str = './books', slug: str = None,
         slug: Custom folder name (optional)
         skip_images: Skip downloading images entirely
         download_all_images: Download all inline images, not just cover
-        local_html: Path to local HTML file (optional, skips download)
+        local_html: Path to local HTML file or HTML zip (optional, skips download)
         cb_essay: Output in CB-Essay format (_essay/, _data/book.yml, objects/)
         project_root: Project root directory for CB-Essay mode (default: current dir)
+        image_workers: Number of concurrent inline image downloads
+        catalog_db: Path to the local RDF catalog index (optional, see --ingest-catalog)
+        stream: Parse the HTML incrementally as it is read instead of loading it first
+        profiler: Records per-stage timings (and the parse trace) when given
+        journal: Progress journal recording each completed stage (optional)
+        resume: Skip the book if the journal has it written; reuse the HTML
+            an interrupted run already fetched
+        derivatives: Create thumbs/ and small/ derivatives of downloaded images
+        webp: Also create WebP derivatives
+        html_zip: Download Gutenberg's HTML zip and take the HTML and images
+            from it, instead of fetching the HTML and every image separately
 
     Returns:
         True if successful, False otherwise
@@ -1459,200 +4347,609 @@ def extract_book(book_id: str, output_base: str = './books', slug: str = None,
     print(f"Extracting Project Gutenberg Book #{book_id}")
     print("=" * 60)
 
+    kept_html = None
+    if journal and resume:
+        last = journal.last_stage(book_id)
+        if last and last['stage'] == 'written':
+            print(f"  ✓ Already written at {last['time']} (journal {journal.path}), skipping")
+            return True
+        kept_html = journal.fetched_html(book_id)
+
+    def journal_stage(stage: str, **details) -> None:
+        if journal:
+            journal.record(book_id, stage, **details)
+
     html_content = None
     html_url = None
-
-    # Check for local HTML file first
-    if local_html:
-        print(f"\n[1/5] Loading local HTML file: {local_html}")
-        try:
-            with open(local_html, 'r', encoding='utf-8', errors='replace') as f:
-                html_content = f.read()
+    archive = None
+    cover_future = None
+    gutendex_future = None  # network metadata, merged by prepare_output()
+    root_path = Path(project_root) if project_root else Path.cwd()
+    output = {}
+    profiler = profiler or StageProfiler(enabled=False)
+    rdf_future = None
+    html_digest = hashlib.sha256()
+    manifest = ExtractionManifest(root_path if cb_essay else Path(output_base), book_id)
+    # Spooled downloads and the HTML zip are released on every return path
+    with contextlib.ExitStack() as cleanup:
+        # Without a shared store, downloads are spooled next to the book folders
+        image_store = image_store_for(Path(output_base))
+        if isinstance(image_store, SpooledDownloads):
+            cleanup.callback(image_store.discard)
+        options = {'cb_essay': cb_essay, 'slug': slug, 'skip_images': skip_images,
+                   'download_all_images': download_all_images, 'derivatives': derivatives, 'webp': webp,
+                   'html_zip': html_zip, 'local_html': str(local_html) if local_html else None,
+                   'catalog_db': str(catalog_db) if catalog_db else None}
+
+        def hashed(chunks):
+            # Hash the HTML for the manifest as it streams past
+            for chunk in chunks:
+                html_digest.update(chunk)
+                yield chunk
+
+        def loaded(raw: bytes, newlines: bool = False, keep: bool = False) -> str:
+            # Hash the HTML for the manifest as read (and keep it for a
+            # resume), then decode it - with newlines translated, as a
+            # text-mode read of a file does
+            html_digest.update(raw)
+            if keep and journal:
+                journal.keep_html(book_id, raw)
+            content = raw.decode('utf-8', errors='replace')
+            if newlines and '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+            return content
+
+        def current_sources() -> Dict:
+            # Everything the output is derived from, as hashes for the manifest
+            sources = {'html': html_digest.hexdigest()}
+            if gutendex_future:
+                sources['gutendex'] = content_digest(gutendex_future.result())
+            if rdf_future:
+                sources['rdf'] = content_digest(rdf_future.result())
+            if catalog_db:
+                sources['catalog'] = content_digest(json.dumps(lookup_catalog(catalog_db, book_id), sort_keys=True))
+            if cover_future:
+                cover = cover_future.result()
+                sources['cover'] = cover[1] if cover else None
+            if archive:
+                sources['archive'] = archive.digest
+            return sources
+
+        def prepare_output() -> Tuple[Path, Dict]:
+            # Step 3, run when the first section is ready to be written (or
+            # after the parse if there is none). By then the <head> and header
+            # lines have been parsed, so the metadata is as complete as it gets.
+            with profiler.stage('metadata'):
+                if not output:
+                    # Merge metadata in priority order: rich API first, then
+                    # authoritative RDF (from the local index when available)
+                    if gutendex_future:
+                        meta_extractor.extract_from_gutendex(gutendex_future.result(), prefetched=True)
+                    if rdf_future:
+                        meta_extractor.extract_from_rdf(rdf_future.result(), prefetched=True)
+                    elif not local_html and use_catalog:
+                        meta_extractor.extract_from_catalog(catalog_db)
+
+                    # Then the HTML meta tags as additional source, then body text
+                    # (most reliable per extraction guide)
+                    print("\n[3/5] Merging metadata...")
+                    scan = parser.get_scan_results()
+                    meta_extractor.apply_html_meta(scan['dc_meta'], scan['page_title'])
+                    body_metadata = extract_metadata_from_body_text(scan['header_text'])
+                    # Merge body text metadata (use as fallback for missing fields)
+                    current_metadata = meta_extractor.get_metadata()
+                    for key, value in body_metadata.items():
+                        if key not in current_metadata or not current_metadata[key]:
+                            meta_extractor.metadata[key] = value
+
+                    metadata = meta_extractor.get_metadata()
+
+                    print(f"  Title: {metadata.get('title', 'Unknown')}")
+                    print(f"  Author: {metadata.get('author', 'Unknown')}")
+
+                    # Determine output directory
+                    output['metadata'] = metadata
+                    output['dir'] = Path(output_base) / (slug or create_slug(
+                        metadata.get('title'), metadata.get('author'), book_id))
+                    print(f"\n  Output directory: {output['dir']}")
+                    print("\nSaving sections as they are parsed...")
+
+            section_dir = root_path / '_essay' if cb_essay else output['dir']
+            return section_dir, output['metadata']
+
+        # Sections go straight from the parser to disk
+        writer = SectionWriter(prepare_output, cb_essay=cb_essay)
+        write_section = profiler.timed('write', writer.write)
+        parser = GutenbergHTMLParser(single_pass=True, on_section=write_section)
+        parsed = False
+
+        def parse_stream(chunks) -> bool:
+            # Step 2 in streaming mode: parse while the bytes are still arriving
+            print("\n[2/5] Parsing content and converting to Markdown (streaming)...")
+            try:
+                with profiler.stage('parse'), profiler.trace():
+                    size = feed_parser(parser, profiler.iterate('download', hashed(chunks)))
+            except (OSError, http.client.HTTPException) as e:
+                print(f"  ERROR: HTML stream failed: {e}")
+                return False
+            print(f"  ✓ Parsed {size} bytes")
+            return True
+
+        # Check for local HTML file first
+        if local_html:
             html_url = f"file://{Path(local_html).absolute()}"
-            print(f"  ✓ Loaded {len(html_content)} bytes")
-        except Exception as e:
-            print(f"  ERROR: Could not read local file: {e}")
-            return False
-
-        # Extract metadata from local HTML
-        print("\n[2/5] Extracting metadata from HTML...")
-        meta_extractor = MetadataExtractor(book_id)
-        meta_extractor.extract_from_html(html_content)
-    else:
-        # Step 1: Fetch metadata from online sources
-        print("\n[1/5] Extracting metadata...")
-        meta_extractor = MetadataExtractor(book_id)
-        meta_extractor.extract_from_gutendex()  # Try rich API first
-        meta_extractor.extract_from_rdf()  # Then authoritative RDF
-
-        # Step 2: Download HTML
-        print("\n[2/5] Downloading HTML content...")
-        html_content, html_url = download_html(book_id)
-        if not html_content:
-            print("ERROR: Could not download HTML from any source")
-            print("\nTIP: You can download the HTML manually and use --local-html flag:")
-            print(f"     wget -O book.html 'https://www.gutenberg.org/cache/epub/{book_id}/pg{book_id}-images.html'")
-            print(f"     python gutenberg-extraction.py {book_id} --local-html book.html")
-            return False
-
-        # Extract metadata from HTML as additional source
-        meta_extractor.extract_from_html(html_content)
-
-    # Also extract metadata from body text (most reliable per extraction guide)
-    body_metadata = extract_metadata_from_body_text(html_content)
-    # Merge body text metadata (use as fallback for missing fields)
-    current_metadata = meta_extractor.get_metadata()
-    for key, value in body_metadata.items():
-        if key not in current_metadata or not current_metadata[key]:
-            meta_extractor.metadata[key] = value
-
-    metadata = meta_extractor.get_metadata()
-
-    print(f"  Title: {metadata.get('title', 'Unknown')}")
-    print(f"  Author: {metadata.get('author', 'Unknown')}")
-
-    # Determine output directory
-    if not slug:
-        slug = create_slug(metadata.get('title'), metadata.get('author'), book_id)
-    output_dir = Path(output_base) / slug
-    print(f"\n  Output directory: {output_dir}")
-
-    # Step 3: Download images
-    print("\n[3/5] Processing images...")
-    image_extractor = ImageExtractor(book_id, output_dir)
-
-    if not skip_images:
-        image_extractor.download_cover()
-
-        if download_all_images:
-            image_extractor.extract_images_from_html(html_content, html_url)
-    else:
-        print("  Skipping images (--skip-images flag)")
-
-    images_result = image_extractor.get_results()
-
-    # Step 4: Parse HTML and convert to markdown
-    print("\n[4/5] Parsing content and converting to Markdown...")
-
-    # Remove boilerplate using text markers (most reliable per extraction guide)
-    clean_html = remove_gutenberg_boilerplate(html_content)
-    print(f"  Removed boilerplate: {len(html_content)} -> {len(clean_html)} chars")
+            if str(local_html).lower().endswith('.zip'):
+                print(f"\n[1/5] Opening local HTML archive: {local_html}")
+                with profiler.stage('download'):
+                    archive = load_archive(Path(local_html), Path(local_html).absolute().parent.as_uri() + '/')
+                if archive is None:
+                    return False
+                cleanup.callback(archive.close)
+                html_url = archive.html_url()
+                if stream:
+                    html_chunks = archive.open_html()
+                else:
+                    with profiler.stage('download'):
+                        html_content = loaded(archive.read_html())
+                    print(f"  ✓ Loaded {len(html_content)} bytes from {archive.html_member}")
+            elif stream:
+                print(f"\n[1/5] Streaming local HTML file: {local_html}")
+                try:
+                    html_chunks = iter_file_chunks(open(local_html, 'rb'))
+                except OSError as e:
+                    print(f"  ERROR: Could not read local file: {e}")
+                    return False
+            else:
+                print(f"\n[1/5] Loading local HTML file: {local_html}")
+                try:
+                    with profiler.stage('download'):
+                        html_content = loaded(Path(local_html).read_bytes(), newlines=True)
+                    print(f"  ✓ Loaded {len(html_content)} bytes")
+                except Exception as e:
+                    print(f"  ERROR: Could not read local file: {e}")
+                    return False
+
+            # Metadata from the offline catalog, if any; the HTML adds to it below
+            meta_extractor = MetadataExtractor(book_id)
+            if catalog_db:
+                with profiler.stage('metadata'):
+                    meta_extractor.extract_from_catalog(catalog_db)
+
+            if stream and not parse_stream(html_chunks):
+                return False
+            parsed = stream
+        else:
+            # Step 1: Fetch metadata, HTML and cover concurrently - none of them
+            # depends on another until the merge below
+            print("\n[1/5] Fetching metadata, HTML content and cover...")
+            meta_extractor = MetadataExtractor(book_id)
+            use_catalog = bool(catalog_db and lookup_catalog(catalog_db, book_id))
+
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                # Gutendex is a network API: with a mirror, metadata comes from its RDF
+                gutendex_future = None if MIRROR else pool.submit(
+                    profiler.timed('metadata', meta_extractor.fetch_gutendex))
+                rdf_future = None if use_catalog else pool.submit(
+                    profiler.timed('metadata', meta_extractor.fetch_rdf))
+                archive_future = pool.submit(
+                    profiler.timed('download', download_archive), book_id, image_store) if html_zip else None
+                html_future = None if stream or kept_html or html_zip else pool.submit(
+                    profiler.timed('download', download_html), book_id)
+                if not skip_images:
+                    cover_future = pool.submit(profiler.timed('images', fetch_cover), book_id, image_store)
+
+                if archive_future:
+                    archive = archive_future.result()
+                    if archive is None:
+                        print("  Warning: No HTML archive, fetching the HTML and images separately")
+                    else:
+                        cleanup.callback(archive.close)
+
+                if kept_html:
+                    # Resuming: the interrupted run already downloaded the HTML
+                    html_path, html_url = kept_html
+                    print(f"  ✓ Resuming with the HTML fetched by an earlier run: {html_path}")
+                    if stream:
+                        if not parse_stream(iter_file_chunks(open(html_path, 'rb'))):
+                            return False
+                        parsed = True
+                    else:
+                        with profiler.stage('download'):
+                            html_content = loaded(html_path.read_bytes(), newlines=True)
+                elif archive:
+                    html_url = archive.html_url()
+                    if stream:
+                        html_chunks = archive.open_html()
+                        if journal:
+                            html_chunks = journal.keep_stream(book_id, html_chunks)
+                        if not parse_stream(html_chunks):
+                            return False
+                        parsed = True
+                    else:
+                        with profiler.stage('download'):
+                            html_content = loaded(archive.read_html(), keep=True)
+                elif stream:
+                    # Parse here, overlapping the download with the other fetches
+                    with profiler.stage('download'):
+                        html_chunks, html_url = open_html_stream(book_id)
+                    if html_chunks is not None:
+                        if journal:
+                            html_chunks = journal.keep_stream(book_id, html_chunks)
+                        if not parse_stream(html_chunks):
+                            return False
+                        parsed = True
+                else:
+                    html_raw, html_url = (html_future.result() if html_future
+                                          else profiler.timed('download', download_html)(book_id))
+                    if html_raw:
+                        html_content = loaded(html_raw, keep=True)
+                    # Only the decoded text is needed from here on
+                    html_future = html_raw = None
+
+            if not html_content and not parsed:
+                print("ERROR: Could not download HTML from any source")
+                print("\nTIP: You can download the HTML manually and use --local-html flag:")
+                print(f"     wget -O book.html 'https://www.gutenberg.org/cache/epub/{book_id}/pg{book_id}-images.html'")
+                print(f"     python gutenberg-extraction.py {book_id} --local-html book.html")
+                return False
+
+        journal_stage('fetched', url=html_url)
+
+        # Step 2: Parse HTML and convert to markdown. One pass over the raw
+        # document finds the boilerplate markers, TOC anchors, header metadata,
+        # meta tags and images along with the sections, which are written out
+        # as they close.
+        if not parsed:
+            # Unchanged inputs and intact outputs: nothing to do. (A streamed book
+            # is parsed as it arrives, so there the check is left to the writes.)
+            if manifest.previous and manifest.is_current(current_sources(), options):
+                print(f"\n  ✓ Sources and outputs unchanged since the last extraction ({manifest.path}), skipping")
+                journal_stage('written')
+                return True
+
+            print("\n[2/5] Parsing content and converting to Markdown...")
+            with profiler.stage('parse'), profiler.trace():
+                parser.feed(html_content)
+                parser.close()
+        with profiler.stage('parse'):
+            parser.get_results()
+        scan = parser.get_scan_results()
+        _, metadata = prepare_output()
+        output_dir = output['dir']
+
+        if scan['start_marker_line'] or scan['end_marker_line']:
+            print(f"  Boilerplate markers: content between lines "
+                  f"{scan['start_marker_line'] or 1} and {scan['end_marker_line'] or 'end'}")
+        if scan['toc_anchors']:
+            print(f"  Found {len(scan['toc_anchors'])} TOC anchor links")
+        print(f"  Found {len(writer.front_matter)} front matter sections")
+        print(f"  Found {len(writer.chapters)} chapters/parts")
+
+        # Handle case with no chapters found
+        if not writer.chapters and not writer.front_matter:
+            print("  No chapters detected - extracting as single document...")
+            content = parser.get_whole_book_content()
 
-    # Extract TOC anchors to help identify section boundaries
-    toc_anchors = extract_toc_anchors(html_content)
-    if toc_anchors:
-        print(f"  Found {len(toc_anchors)} TOC anchor links")
+            if content:
+                write_section({
+                    'id': 'full-text',
+                    'title': metadata.get('title', 'Full Text'),
+                    'content': content,
+                    'type': 'chapter'
+                })
+            else:
+                print("ERROR: Could not extract any content")
+                return False
+
+        with profiler.stage('write'):
+            writer.finish()
+        front_matter, chapters = writer.front_matter, writer.chapters
+        journal_stage('parsed', sections=len(front_matter) + len(chapters))
+
+        # Step 4: Download images
+        print("\n[4/5] Processing images...")
+        if derivatives and cb_essay:
+            print("  Note: CB-Essay mode only references image URLs, so there are no derivatives to make")
+        make_derivatives = derivatives and not skip_images and not cb_essay
+        image_extractor = ImageExtractor(book_id, output_dir, workers=image_workers,
+                                         derivatives=DerivativeMaker(webp) if make_derivatives else None,
+                                         store=image_store, archive=archive)
+
+        if not skip_images:
+            with profiler.stage('images'):
+                if cover_future:
+                    image_extractor.download_cover(cover_future.result(), prefetched=True)
+                else:
+                    image_extractor.download_cover()
 
-    parser = GutenbergHTMLParser(toc_anchors=toc_anchors)
-    parser.feed(clean_html)
-    front_matter, chapters, _ = parser.get_results()
+                if download_all_images:
+                    image_extractor.download_images(scan['image_refs'], html_url)
+                image_extractor.finish_derivatives()
+        else:
+            print("  Skipping images (--skip-images flag)")
+
+        images_result = image_extractor.get_results()
+
+        # CB-Essay mode: save to _essay/, _data/book.yml (with image URLs, no downloads)
+        if cb_essay:
+            print("\n[5/5] Saving in CB-Essay format...")
+
+            # Extract image URLs (don't download - just collect URLs for book.yml)
+            with profiler.stage('images'):
+                image_urls = extract_image_urls(book_id, html_content or '', html_url or '',
+                                                image_refs=scan['image_refs'])
+            print(f"  Collected {len(image_urls.get('cover_urls', []))} cover URL(s)")
+            print(f"  Collected {len(image_urls.get('inline_images', []))} inline image URL(s)")
+
+            # Essay files are already written; add book.yml
+            with profiler.stage('write'):
+                yaml_path = save_cb_essay_book_yml(root_path, metadata, image_urls, writer.sections_info())
+                manifest.save(current_sources(), options,
+                              [root_path / '_essay' / s['filename'] for s in front_matter + chapters] + [yaml_path])
+            journal_stage('written')
+
+            # Clean up temp directory if it exists and is different from project root
+            if output_dir != root_path and output_dir.exists():
+                shutil.rmtree(output_dir)
+
+            # Summary for CB-Essay mode
+            print("\n" + "=" * 60)
+            print("✓ CB-Essay Extraction Complete!")
+            print("=" * 60)
+            print(f"  Project root:     {root_path}")
+            print(f"  Essay files:      _essay/ ({len(front_matter) + len(chapters)} files)")
+            print(f"  Metadata file:    _data/book.yml")
+            print(f"  Image URLs:       {len(image_urls.get('inline_images', []))} inline + {len(image_urls.get('cover_urls', []))} cover")
+
+            return True
+
+        # Step 5: Create YAML data file (markdown files are already written)
+        print("\n[5/5] Creating 000-data.yml...")
+        with profiler.stage('write'):
+            sections_info = writer.sections_info()
+
+            yaml_content = create_yaml_data(metadata, images_result, sections_info)
+            yaml_path = output_dir / '000-data.yml'
+
+            changed = write_if_changed(yaml_path, yaml_content, ignore=EXTRACTED_AT_RE)
+            print(f"  ✓ 000-data.yml{'' if changed else ' (unchanged)'}")
+
+            # Create README
+            readme_content = f"# {metadata.get('title', 'Unknown')}\n\n"
+            if metadata.get('author'):
+                readme_content += f"*by {metadata['author']}*\n\n"
+            readme_content += f"Extracted from [Project Gutenberg #{book_id}]({metadata['gutenberg_url']})\n\n"
+            readme_content += f"## Contents\n\n"
+
+            if front_matter:
+                readme_content += "### Front Matter\n\n"
+                for idx, section in enumerate(front_matter, 1):
+                    filename = f"00-{idx:02d}-{sanitize_filename(section['title'])}.md"
+                    readme_content += f"- [{section['title']}]({filename})\n"
+                readme_content += "\n"
+
+            readme_content += "### Chapters\n\n"
+            for idx, chapter in enumerate(chapters, 1):
+                filename = f"{idx:02d}-{sanitize_filename(chapter['title'])}.md"
+                readme_content += f"- [{chapter['title']}]({filename})\n"
+
+            readme_path = output_dir / 'README.md'
+            changed = write_if_changed(readme_path, readme_content)
+            print(f"  ✓ README.md{'' if changed else ' (unchanged)'}")
+
+            manifest.save(current_sources(), options,
+                          [output_dir / s['filename'] for s in front_matter + chapters] +
+                          [image_extractor.images_dir / image['filename'] for image in images_result['images']] +
+                          [image_extractor.images_dir / name for name in images_result['derivatives']] +
+                          [yaml_path, readme_path])
+        journal_stage('written')
+
+        # Summary
+        print("\n" + "=" * 60)
+        print("✓ Extraction Complete!")
+        print("=" * 60)
+        print(f"  Output directory: {output_dir}")
+        print(f"  Metadata file:    000-data.yml")
+        print(f"  Front matter:     {len(front_matter)} sections")
+        print(f"  Chapters:         {len(chapters)} sections")
+        print(f"  Images:           {len(images_result.get('images', []))} downloaded")
+        if images_result.get('cover'):
+            print(f"  Cover image:      images/{images_result['cover']}")
 
-    print(f"  Found {len(front_matter)} front matter sections")
-    print(f"  Found {len(chapters)} chapters/parts")
+        return True
 
-    # Handle case with no chapters found
-    if not chapters and not front_matter:
-        print("  No chapters detected - extracting as single document...")
-        whole_parser = WholeBookParser()
-        whole_parser.feed(html_content)
-        content = whole_parser.get_content()
 
-        if content:
-            chapters = [{
-                'id': 'full-text',
-                'title': metadata.get('title', 'Full Text'),
-                'content': content,
-                'type': 'chapter'
-            }]
-        else:
-            print("ERROR: Could not extract any content")
-            return False
+# =============================================================================
+# Batch Extraction
+# =============================================================================
 
-    # CB-Essay mode: save to _essay/, _data/book.yml (with image URLs, no downloads)
-    if cb_essay:
-        print("\n[5/5] Saving in CB-Essay format...")
-        root_path = Path(project_root) if project_root else Path.cwd()
+def read_book_ids(ids_file: str) -> List[str]:
+    """Read book IDs from a file (one per line, '#' starts a comment)."""
+    book_ids = []
+    with open(ids_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                book_ids.extend(line.replace(',', ' ').split())
+    return book_ids
+
+
+def find_local_html_files(directory: str) -> List[Tuple[str, str]]:
+    """Find Gutenberg HTML files in a directory and infer their book IDs.
+
+    Recognizes the usual Gutenberg file names (pg84-images.html, 84-h.htm,
+    84.html, and the HTML zips 84-h.zip / pg84-h.zip). Files without a
+    number in their name are skipped. A book with several files gets one
+    job, for the first of: its zip (HTML plus images), -images.html, -h.htm,
+    anything else.
+    """
+    def preference(path: Path) -> int:
+        name = path.name.lower()
+        for rank, ending in enumerate(('.zip', '-images.html', '-h.htm')):
+            if name.endswith(ending):
+                return rank
+        return 3
+
+    books = {}  # book ID -> its files
+    for path in sorted(Path(directory).iterdir()):
+        if not path.is_file() or path.suffix.lower() not in ('.htm', '.html', '.zip'):
+            continue
+        id_match = re.match(r'(?:pg)?(\d+)', path.name, re.IGNORECASE)
+        if not id_match:
+            print(f"  Warning: Cannot infer book ID from {path.name}, skipping")
+            continue
+        books.setdefault(id_match.group(1), []).append(path)
+
+    jobs = []
+    for book_id, paths in books.items():
+        paths.sort(key=preference)
+        for path in paths[1:]:
+            print(f"  Warning: {path.name} is another copy of book #{book_id} (using {paths[0].name}), skipping")
+        jobs.append((book_id, str(paths[0])))
+    return jobs
+
+
+def run_batch_job(book_id: str, local_html: Optional[str], project_root: Optional[str],
+                  profile_options: Optional[Tuple[bool, int]], kwargs: Dict) -> Dict:
+    """Extract one book of a batch and summarize the outcome.
+
+    Runs on a pool thread or in a worker process; either way only the small
+    summary dict goes back, never the book. profile_options is
+    (trace_parse, top), or None for no profile. 'cpu' is the process CPU
+    time over the job, all of its threads included (fetches, images,
+    derivatives): the book's own on a process pool, where a worker runs one
+    job at a time, but shared with the other books on a thread pool.
+    """
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    error = None
+    profiler = StageProfiler.for_book(book_id, kwargs.get('output_base', './books'),
+                                      *profile_options) if profile_options else None
+    try:
+        success = extract_book(
+            book_id=book_id,
+            local_html=local_html,
+            project_root=project_root,
+            profiler=profiler,
+            **kwargs
+        )
+    except Exception as e:
+        success = False
+        error = f"{type(e).__name__}: {e}"
+    if profiler:
+        profiler.save()
+    return {
+        'book_id': book_id,
+        'success': success,
+        'elapsed': time.perf_counter() - started,
+        'cpu': time.process_time() - cpu_started,
+        'error': error,
+    }
 
-        # Extract image URLs (don't download - just collect URLs for book.yml)
-        image_urls = extract_image_urls(book_id, html_content, html_url or '')
-        print(f"  Collected {len(image_urls.get('cover_urls', []))} cover URL(s)")
-        print(f"  Collected {len(image_urls.get('inline_images', []))} inline image URL(s)")
 
-        # Save essay files and book.yml
-        result = save_cb_essay_files(front_matter, chapters, root_path, metadata, image_urls)
+def init_batch_process(cache_settings: Optional[Tuple[Path, int, float]],
+                       image_store: Optional[Path] = None, rate: float = HOST_RATE,
+                       mirror_root: Optional[Path] = None) -> None:
+    """Process pool initializer: a private HTTP client, cache and image store per worker.
 
-        # Clean up temp directory if it exists and is different from project root
-        if output_dir != root_path and output_dir.exists():
-            import shutil
-            shutil.rmtree(output_dir)
+    Connections must not be shared with the parent process, and with the
+    spawn start method the parent's globals are not inherited at all.
+    """
+    global HTTP_CLIENT, HTTP_CACHE, IMAGE_STORE, MIRROR
+    HTTP_CLIENT = HTTPClient(rate=rate)
+    HTTP_CACHE = HTTPCache(*cache_settings) if cache_settings else None
+    IMAGE_STORE = BlobStore(image_store) if image_store else None
+    MIRROR = GutenbergMirror(mirror_root) if mirror_root else None
 
-        # Summary for CB-Essay mode
-        print("\n" + "=" * 60)
-        print("✓ CB-Essay Extraction Complete!")
-        print("=" * 60)
-        print(f"  Project root:     {root_path}")
-        print(f"  Essay files:      _essay/ ({len(front_matter) + len(chapters)} files)")
-        print(f"  Metadata file:    _data/book.yml")
-        print(f"  Image URLs:       {len(image_urls.get('inline_images', []))} inline + {len(image_urls.get('cover_urls', []))} cover")
 
-        return True
+def extract_batch(jobs: List[Tuple[str, Optional[str]]], workers: int = DEFAULT_WORKERS,
+                  cb_essay: bool = False, project_root: str = None,
+                  profile: bool = False, profile_parse: bool = False,
+                  profile_top: int = PROFILE_TOP, processes: int = 0, **kwargs) -> List[Dict]:
+    """Run extract_book() for many books on a thread or process pool.
 
-    # Standard mode: save markdown files
-    saved_files = save_markdown_files(front_matter, chapters, output_dir, metadata)
+    Each book is isolated: a failure or exception in one book never affects
+    the others, and in CB-Essay mode every book gets its own project root
+    (<project_root>/pg<id>) so the _essay/ folders do not collide.
 
-    # Step 5: Create YAML data file
-    print("\n[5/5] Creating 000-data.yml...")
-    sections_info = {
-        'front_matter_count': len(front_matter),
-        'chapter_count': len(chapters),
-        'total_sections': len(front_matter) + len(chapters),
-        'files': saved_files
-    }
+    Threads overlap downloads, but the parse holds the GIL. For CPU-bound
+    conversion of local HTML, processes > 0 runs the books in that many
+    worker processes instead, so parsing and writing use every core.
 
-    yaml_content = create_yaml_data(metadata, images_result, sections_info)
-    yaml_path = output_dir / '000-data.yml'
+    Args:
+        jobs: List of (book_id, local_html) tuples; local_html may be None
+        workers: Number of books processed concurrently (thread pool)
+        cb_essay: Output in CB-Essay format
+        project_root: Base directory for the per-book CB-Essay roots
+        profile: Write a per-book stage profile (see StageProfiler)
+        profile_parse: Also trace each parse with cProfile and tracemalloc
+        profile_top: Hot functions / allocation sites kept in each profile
+        processes: Use a process pool of this size instead of threads (0: threads)
+        **kwargs: Passed through to extract_book()
 
-    with open(yaml_path, 'w', encoding='utf-8') as f:
-        f.write(yaml_content)
-    print(f"  ✓ 000-data.yml")
+    Returns:
+        List of result dicts (book_id, success, elapsed, cpu, error) in job order
+    """
+    base_root = Path(project_root) if project_root else Path.cwd()
+    profile_options = (profile_parse, profile_top) if profile else None
+
+    if processes:
+        cache = HTTP_CACHE
+        cache_settings = (cache.cache_dir, cache.max_bytes, cache.ttl) if cache else None
+        print(f"Batch extraction: {len(jobs)} books in {processes} processes")
+        # Each process paces its own requests, so they share the per-host rate
+        pool = ProcessPoolExecutor(max_workers=processes, initializer=init_batch_process,
+                                   initargs=(cache_settings, IMAGE_STORE.root if IMAGE_STORE else None,
+                                             HTTP_CLIENT.scheduler.rate / processes,
+                                             MIRROR.root if MIRROR else None))
+    else:
+        print(f"Batch extraction: {len(jobs)} books with {workers} workers")
+        pool = ThreadPoolExecutor(max_workers=max(1, workers))
+
+    results = {}
+    with pool:
+        futures = {pool.submit(run_batch_job, book_id, local_html,
+                               str(base_root / f"pg{book_id}") if cb_essay else None,
+                               profile_options, dict(kwargs, cb_essay=cb_essay)): idx
+                   for idx, (book_id, local_html) in enumerate(jobs)}
+        for future in as_completed(futures):
+            idx = futures[future]
+            try:
+                results[idx] = future.result()
+            except Exception as e:
+                # A worker process died (BrokenProcessPool) or the job did not pickle
+                results[idx] = {'book_id': jobs[idx][0], 'success': False, 'elapsed': 0.0,
+                                'cpu': 0.0, 'error': f"{type(e).__name__}: {e}"}
+
+    return [results[idx] for idx in range(len(jobs))]
+
+
+def print_batch_summary(results: List[Dict], wall_time: float, processes: int = 0) -> None:
+    """Print a summary table of a batch run (with the CPU use of process pools)."""
+    succeeded = [r for r in results if r['success']]
+    failed = [r for r in results if not r['success']]
 
-    # Create README
-    readme_content = f"# {metadata.get('title', 'Unknown')}\n\n"
-    if metadata.get('author'):
-        readme_content += f"*by {metadata['author']}*\n\n"
-    readme_content += f"Extracted from [Project Gutenberg #{book_id}]({metadata['gutenberg_url']})\n\n"
-    readme_content += f"## Contents\n\n"
-
-    if front_matter:
-        readme_content += "### Front Matter\n\n"
-        for idx, section in enumerate(front_matter, 1):
-            filename = f"00-{idx:02d}-{sanitize_filename(section['title'])}.md"
-            readme_content += f"- [{section['title']}]({filename})\n"
-        readme_content += "\n"
-
-    readme_content += "### Chapters\n\n"
-    for idx, chapter in enumerate(chapters, 1):
-        filename = f"{idx:02d}-{sanitize_filename(chapter['title'])}.md"
-        readme_content += f"- [{chapter['title']}]({filename})\n"
-
-    readme_path = output_dir / 'README.md'
-    with open(readme_path, 'w', encoding='utf-8') as f:
-        f.write(readme_content)
-    print(f"  ✓ README.md")
-
-    # Summary
     print("\n" + "=" * 60)
-    print("✓ Extraction Complete!")
+    print("Batch Summary")
     print("=" * 60)
-    print(f"  Output directory: {output_dir}")
-    print(f"  Metadata file:    000-data.yml")
-    print(f"  Front matter:     {len(front_matter)} sections")
-    print(f"  Chapters:         {len(chapters)} sections")
-    print(f"  Images:           {len(images_result.get('images', []))} downloaded")
-    if images_result.get('cover'):
-        print(f"  Cover image:      images/{images_result['cover']}")
-
-    return True
+    print(f"  {'Book':<10} {'Status':<8} {'Time':>9}  Error")
+    for r in results:
+        status = 'ok' if r['success'] else 'FAILED'
+        print(f"  {r['book_id']:<10} {status:<8} {r['elapsed']:>8.1f}s  {r['error'] or ''}")
+    print("-" * 60)
+    print(f"  Succeeded: {len(succeeded)}  Failed: {len(failed)}  Wall time: {wall_time:.1f}s")
+    if results:
+        serial_time = sum(r['elapsed'] for r in results)
+        print(f"  Sum of per-book time: {serial_time:.1f}s "
+              f"(overlap factor {serial_time / max(wall_time, 1e-9):.1f}x)")
+    if results and processes:
+        # Total CPU over wall time: how many cores the pool kept busy
+        # (per-book elapsed time would also count overlapped network waits)
+        cores = min(processes, os.cpu_count() or 1)
+        cpu_time = sum(r.get('cpu', 0.0) for r in results)
+        busy = cpu_time / max(wall_time, 1e-9)
+        print(f"  Process pool: {processes} processes on {cores} cores, CPU time {cpu_time:.1f}s, "
+              f"{busy:.1f} cores busy ({busy / cores:.0%} of {cores})")
 
 
 def main():
@@ -1665,8 +4962,14 @@ Examples:
   %(prog)s 1342 --output ./essays       # Extract Pride and Prejudice to ./essays
   %(prog)s 84 --slug frankenstein       # Extract Frankenstein with custom folder name
   %(prog)s 11 --all-images              # Extract Alice's Adventures with all images
+  %(prog)s 11 --all-images --derivatives  # ...plus thumbs/ and small/ derivatives
   %(prog)s 84 --local-html pg84.html    # Use locally downloaded HTML file
+  %(prog)s 11 --zip --all-images        # HTML and images from one download of 11-h.zip
+  %(prog)s 11 --local-html 11-h.zip --all-images  # ...or from a local copy of the zip
   %(prog)s 84 --cb-essay                # Extract directly into CB-Essay structure
+  %(prog)s 84 --stream                  # Parse the HTML while it downloads
+  %(prog)s 84 --profile                 # Time each stage, report in ./books/profile-pg84.json
+  %(prog)s 84 --profile-parse           # ...plus cProfile/tracemalloc hot spots of the parse
 
 CB-Essay mode (--cb-essay):
   Outputs files directly into a CollectionBuilder-Essay project structure:
@@ -1674,14 +4977,58 @@ CB-Essay mode (--cb-essay):
   - Metadata -> _data/book.yml
   - Images -> objects/ folder
 
+Batch mode (several IDs, --ids-file, or a --local-html directory):
+  %(prog)s 84 1342 64317 --workers 4    # Extract three books concurrently
+  %(prog)s --ids-file shelf.txt         # One book ID per line
+  %(prog)s --local-html ./mirror/       # Every pg<ID>*.html / <ID>-h.htm file
+  %(prog)s --local-html ./mirror/ --processes 0  # ...converted on every core
+  %(prog)s 84 1342 64317 --resume      # Journaled: the same command continues an interrupted run
+  %(prog)s --mirror-root /srv/gutenberg --processes 0  # Every book in a local mirror, offline
+  %(prog)s --ids-file shelf.txt --workers 16 --rate 2  # Many books, at most 2 requests/s per host
+  Each book gets its own output folder (CB-Essay mode: <project-root>/pg<ID>/)
+  and a summary table of successes, failures and per-book time is printed.
+  With --resume, progress is journaled in <output>/.gutenberg-journal/
+  (CB-Essay mode: <project-root>/.gutenberg-journal/): books an earlier
+  --resume run wrote are skipped and unfinished ones reuse their fetched HTML.
+  Requests to each host are paced (--rate) and their concurrency adapts to
+  the host's latency and errors; 429/503 Retry-After is honored, and a host
+  that keeps failing is skipped for a cooldown instead of retried per book.
+
+Re-running on an existing output:
+  Each book's sources and outputs are hashed into <output>/.gutenberg-manifest/
+  (CB-Essay mode: <project-root>/.gutenberg-manifest/). A book whose sources
+  are unchanged is skipped; otherwise only files whose bytes differ are
+  rewritten (a new extracted_at alone does not count), so incremental site
+  builds only see real changes.
+
+Offline metadata (--ingest-catalog):
+  wget https://www.gutenberg.org/cache/epub/feeds/rdf-files.tar.bz2
+  %(prog)s --ingest-catalog rdf-files.tar.bz2   # Build the SQLite index once
+  Later runs answer RDF metadata from the index (--catalog-db) instead of
+  fetching one .rdf per book.
+
+Local mirror (--mirror-root):
+  rsync -av aleph.gutenberg.org::gutenberg-epub /srv/gutenberg/cache/epub
+  %(prog)s 84 --mirror-root /srv/gutenberg --all-images
+  gutenberg.org URLs are read from the same paths under the mirror root
+  (files/<ID>/ also from the digit tree, e.g. 1/3/4/1342/), so HTML, RDF,
+  covers and images need no network. Gutendex is not queried.
+
 If downloads fail (403 errors), download HTML manually:
   wget -O book.html 'https://www.gutenberg.org/cache/epub/84/pg84-images.html'
   %(prog)s 84 --local-html book.html
         """
     )
 
-    parser.add_argument('book_id', type=str,
-                        help='Project Gutenberg book ID (e.g., 64317 for Great Gatsby)')
+    parser.add_argument('book_id', type=str, nargs='*',
+                        help='Project Gutenberg book ID(s) (e.g., 64317 for Great Gatsby)')
+    parser.add_argument('--ids-file', metavar='FILE',
+                        help='File with one book ID per line (batch mode)')
+    parser.add_argument('--workers', '-w', type=int, default=DEFAULT_WORKERS,
+                        help=f'Books processed concurrently in batch mode (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--processes', type=int, metavar='N',
+                        help='Convert books in N worker processes instead of threads, for CPU-bound '
+                             'local batches (0: one per core)')
     parser.add_argument('--output', '-o', default='./books',
                         help='Output directory (default: ./books)')
     parser.add_argument('--slug', '-s',
@@ -1690,29 +5037,171 @@ If downloads fail (403 errors), download HTML manually:
                         help='Skip downloading images')
     parser.add_argument('--all-images', action='store_true',
                         help='Download all inline images (not just cover)')
-    parser.add_argument('--local-html', '-l', metavar='FILE',
-                        help='Path to locally downloaded HTML file (skips download)')
+    parser.add_argument('--image-workers', type=int, default=DEFAULT_IMAGE_WORKERS,
+                        help=f'Concurrent inline image downloads (default: {DEFAULT_IMAGE_WORKERS})')
+    parser.add_argument('--rate', type=float, default=HOST_RATE, metavar='REQ/S',
+                        help=f'Requests per second sent to each host, 0 for no limit (default: {HOST_RATE:g})')
+    parser.add_argument('--derivatives', action='store_true',
+                        help='Create CollectionBuilder images/thumbs/*_th.jpg and images/small/*_sm.jpg '
+                             '(needs Pillow or ImageMagick)')
+    parser.add_argument('--webp', action='store_true',
+                        help='With --derivatives, also create WebP versions')
+    parser.add_argument('--local-html', '-l', metavar='PATH',
+                        help='Path to locally downloaded HTML file, or a directory of them (skips download)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Journal progress and skip books an earlier (interrupted) --resume run '
+                             'finished, reusing fetched HTML for the rest')
+    parser.add_argument('--zip', action='store_true',
+                        help="Download Gutenberg's HTML zip (HTML and all images in one request) "
+                             'instead of the HTML and each image separately')
+    parser.add_argument('--stream', action='store_true',
+                        help='Parse the HTML incrementally as it downloads instead of loading it first')
+    parser.add_argument('--profile', action='store_true',
+                        help='Record wall/CPU time per stage and write <output>/profile-pg<ID>.json')
+    parser.add_argument('--profile-parse', action='store_true',
+                        help='Also run the parse under cProfile and tracemalloc (implies --profile)')
+    parser.add_argument('--profile-top', type=int, default=PROFILE_TOP, metavar='N',
+                        help=f'Hot functions / allocation sites listed (default: {PROFILE_TOP})')
     parser.add_argument('--cb-essay', action='store_true',
                         help='Output in CB-Essay format (_essay/, _data/book.yml, objects/)')
     parser.add_argument('--project-root', metavar='DIR',
                         help='Project root for CB-Essay mode (default: current directory)')
+    parser.add_argument('--cache-dir', metavar='DIR', default=str(DEFAULT_CACHE_DIR),
+                        help=f'HTTP cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Disable the HTTP cache')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_CACHE_MAX_MB,
+                        help=f'Evict least-recently-used cache entries above this size (default: {DEFAULT_CACHE_MAX_MB})')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_CACHE_TTL / 3600, metavar='HOURS',
+                        help=f'Reuse cached responses without revalidation for this long (default: {DEFAULT_CACHE_TTL // 3600})')
+    parser.add_argument('--image-store', metavar='DIR', default=str(DEFAULT_IMAGE_STORE),
+                        help=f'Content-addressed image store shared by all books (default: {DEFAULT_IMAGE_STORE})')
+    parser.add_argument('--no-image-store', action='store_true',
+                        help='Download images straight into each book\'s images/ folder instead '
+                             '(nothing is kept between runs)')
+    parser.add_argument('--mirror-root', metavar='DIR',
+                        help='Read gutenberg.org HTML, RDF, covers and images from this local mirror '
+                             '(no Gutendex); with no book IDs, extract every book in it')
+    parser.add_argument('--catalog-db', metavar='DB', default=str(DEFAULT_CATALOG_DB),
+                        help=f'Local RDF catalog index used instead of per-book RDF requests (default: {DEFAULT_CATALOG_DB})')
+    parser.add_argument('--ingest-catalog', metavar='ARCHIVE',
+                        help='Build the catalog index from rdf-files.tar.bz2 and exit')
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Enable verbose output')
 
     args = parser.parse_args()
 
-    success = extract_book(
-        book_id=args.book_id,
+    if args.ingest_catalog:
+        print(f"Ingesting RDF catalog {args.ingest_catalog} -> {args.catalog_db}")
+        count = ingest_rdf_catalog(args.ingest_catalog, args.catalog_db)
+        print(f"✓ Indexed {count} books")
+        sys.exit(0)
+
+    catalog_db = args.catalog_db if Path(args.catalog_db).exists() else None
+
+    cache = configure_http_cache(None if args.no_cache else args.cache_dir,
+                                 args.cache_max_mb, args.cache_ttl * 3600)
+    image_store = configure_image_store(None if args.no_image_store else args.image_store)
+    configure_http_client(args.rate)
+    mirror = configure_mirror(args.mirror_root)
+
+    book_ids = list(args.book_id)
+    if args.ids_file:
+        book_ids.extend(read_book_ids(args.ids_file))
+    if mirror and not book_ids and not args.local_html:
+        book_ids = mirror.book_ids()
+        print(f"Found {len(book_ids)} books in mirror {mirror.root}")
+
+    if args.local_html and Path(args.local_html).is_dir():
+        jobs = find_local_html_files(args.local_html)
+        if book_ids:
+            jobs = [job for job in jobs if job[0] in book_ids]
+    elif args.local_html:
+        if len(book_ids) != 1:
+            parser.error('--local-html FILE needs exactly one book ID')
+        jobs = [(book_ids[0], args.local_html)]
+    else:
+        jobs = [(book_id, None) for book_id in dict.fromkeys(book_ids)]
+
+    if not jobs:
+        parser.error('no books to extract (give book IDs, --ids-file, a --local-html directory or a --mirror-root)')
+
+    profile = args.profile or args.profile_parse
+    # Journaled (and fetched HTML kept) only when resuming is asked for;
+    # it lives next to the manifests
+    journal_base = Path(args.project_root or Path.cwd()) if args.cb_essay else Path(args.output)
+    journal = ExtractionJournal(journal_base / JOURNAL_DIR) if args.resume else None
+
+    if len(jobs) == 1 and not (args.local_html and Path(args.local_html).is_dir()):
+        profiler = StageProfiler.for_book(jobs[0][0], args.output, args.profile_parse,
+                                          args.profile_top) if profile else None
+        success = extract_book(
+            book_id=jobs[0][0],
+            output_base=args.output,
+            slug=args.slug,
+            skip_images=args.skip_images,
+            download_all_images=args.all_images,
+            local_html=jobs[0][1],
+            cb_essay=args.cb_essay,
+            project_root=args.project_root,
+            image_workers=args.image_workers,
+            catalog_db=catalog_db,
+            stream=args.stream,
+            derivatives=args.derivatives,
+            webp=args.webp,
+            html_zip=args.zip,
+            profiler=profiler,
+            journal=journal,
+            resume=args.resume
+        )
+        if profiler:
+            profiler.save()
+        if cache:
+            print(f"  HTTP cache:       {cache.summary()}")
+        if image_store and not args.skip_images:
+            print(f"  Image store:      {image_store.summary()}")
+        print(f"  HTTP client:      {HTTP_CLIENT.summary()}")
+        sys.exit(0 if success else 1)
+
+    if args.slug:
+        parser.error('--slug cannot be used with several books')
+    processes = 0 if args.processes is None else (args.processes or os.cpu_count() or 1)
+    if args.profile_parse and args.workers > 1 and not processes:
+        # cProfile and tracemalloc are process-wide: one traced parse at a time
+        parser.error('--profile-parse with several books needs --workers 1 or --processes')
+
+    started = time.perf_counter()
+    results = extract_batch(
+        jobs,
+        workers=args.workers,
+        cb_essay=args.cb_essay,
+        project_root=args.project_root,
         output_base=args.output,
-        slug=args.slug,
         skip_images=args.skip_images,
         download_all_images=args.all_images,
-        local_html=args.local_html,
-        cb_essay=args.cb_essay,
-        project_root=args.project_root
+        image_workers=args.image_workers,
+        catalog_db=catalog_db,
+        stream=args.stream,
+        derivatives=args.derivatives,
+        webp=args.webp,
+        html_zip=args.zip,
+        journal=journal,
+        resume=args.resume,
+        profile=profile,
+        profile_parse=args.profile_parse,
+        profile_top=args.profile_top,
+        processes=processes,
     )
-
-    sys.exit(0 if success else 1)
+    print_batch_summary(results, time.perf_counter() - started, processes)
+    # Worker processes have their own cache, store and client; the parent's are idle
+    if not processes:
+        if cache:
+            print(f"  HTTP cache: {cache.summary()}")
+        if image_store and not args.skip_images:
+            print(f"  Image store: {image_store.summary()}")
+        print(f"  HTTP client: {HTTP_CLIENT.summary()}")
+
+    sys.exit(0 if all(r['success'] for r in results) else 1)
 
 
 if __name__ == '__main__':